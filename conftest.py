@@ -0,0 +1,13 @@
+"""
+Pytest configuration for the repository root.
+
+Puts the repository root on sys.path once per session so the tests import
+secure20 and secure20_preflight as top-level modules.
+"""
+
+import sys
+from pathlib import Path
+
+_ROOT = str(Path(__file__).parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
@@ -7,25 +7,70 @@ Main engine that loads payroll data, applies rules, and generates findings.
 import csv
 import sys
 from datetime import datetime, date
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+from secure20.findings import RED_TYPES, YELLOW_TYPES
 from secure20.rules import roth_catchup, auto_enroll, ltpt
 
 
-def _parse_decimal(value: str, field_name: str, row_num: int) -> Decimal:
-    """Parse a decimal value from CSV, raising clear errors on failure."""
+# Valid catch_up_type values, mapped to one shared string object each
+_CATCH_UP_TYPES = {'Roth': 'Roth', 'Traditional': 'Traditional'}
+
+# Required CSV columns, in the order they are read and reported when missing,
+# plus a frozenset of each for the header check
+_PAYROLL_COLUMNS = ('employee_id', 'employee_name', 'gross_pay',
+                    'ytd_gross_pay', 'pay_period_start', 'pay_period_end')
+_PAYROLL_REQUIRED = frozenset(_PAYROLL_COLUMNS)
+_HOURS_COLUMNS = ('employee_id', 'year', 'hours')
+_HOURS_REQUIRED = frozenset(_HOURS_COLUMNS)
+
+
+def _parse_float(value: str, field_name: str, row_num: int) -> float:
+    """Parse a numeric value from CSV as a float, raising clear errors on failure."""
+    try:
+        return float(str(value).strip())
+    except ValueError:
+        raise ValueError(f"{field_name} must be a valid number")
+
+
+def _parse_cents(value: str, field_name: str, row_num: int) -> int:
+    """
+    Parse a money value from CSV into integer cents, raising clear errors on failure.
+    
+    Plain values such as "1234", "1234.5" or "-12.345" take a split-and-int fast
+    path; anything else (exponents, etc.) falls back to Decimal. Amounts with more
+    than two decimal places are rounded half-up to the nearest cent.
+    """
+    text = str(value).strip()
+    digits = text[1:] if text[:1] in ('-', '+') else text
+    whole, _, frac = digits.partition('.')
+    if (whole or frac) and (whole + frac).isascii() and (whole + frac).isdigit():
+        cents = int(whole or '0') * 100 + int(frac[:2].ljust(2, '0'))
+        if frac[2:3] >= '5':
+            cents += 1
+        return -cents if text[0] == '-' else cents
+    
     try:
-        return Decimal(str(value).strip())
+        amount = Decimal(text)
+        if not amount.is_finite():
+            raise ValueError
+        return int(amount.scaleb(2).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
     except (InvalidOperation, ValueError):
         raise ValueError(f"{field_name} must be a valid number")
 
 
 def _parse_date(value: str, field_name: str, row_num: int) -> date:
     """Parse a date value from CSV (YYYY-MM-DD format), raising clear errors on failure."""
+    text = value.strip()
     try:
-        return datetime.strptime(value.strip(), '%Y-%m-%d').date()
+        # Fast path: zero-padded ISO dates go through the C-level fromisoformat;
+        # strptime still handles the non-padded forms it has always accepted.
+        if len(text) == 10 and text[4] == '-' and text[7] == '-':
+            return date.fromisoformat(text)
+        return datetime.strptime(text, '%Y-%m-%d').date()
     except ValueError:
         raise ValueError(f"{field_name} must be in YYYY-MM-DD format")
 
@@ -38,66 +83,102 @@ def load_payroll_data(payroll_path: Path) -> List[Dict]:
         payroll_path: Path to payroll CSV file
         
     Returns:
-        List of dictionaries, each representing a payroll record
+        List of dictionaries, each representing a payroll record. Monetary
+        fields (gross_pay, ytd_gross_pay, catch_up_contribution) are int cents.
         
     Raises:
         SystemExit(2): If CSV file cannot be read or is invalid
     """
-    required_columns = ['employee_id', 'employee_name', 'gross_pay', 
-                       'ytd_gross_pay', 'pay_period_start', 'pay_period_end']
-    
     try:
         with open(payroll_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            fieldnames = next(reader, None)
             
             # Check for required columns
-            if not reader.fieldnames:
+            if not fieldnames:
                 print("Error: CSV file is empty or has no header row", file=sys.stderr)
                 sys.exit(2)
             
-            missing_columns = [col for col in required_columns if col not in reader.fieldnames]
-            if missing_columns:
+            missing = _PAYROLL_REQUIRED - set(fieldnames)
+            if missing:
+                missing_columns = [col for col in _PAYROLL_COLUMNS if col in missing]
                 print(f"Error: Missing required CSV columns: {', '.join(missing_columns)}", file=sys.stderr)
                 sys.exit(2)
             
+            # Resolve column positions once; rows are read as plain lists rather
+            # than building a dict per row (duplicate headers: last one wins).
+            column_index = {name: i for i, name in enumerate(fieldnames)}
+            width = len(fieldnames)
+            get_required = itemgetter(*[column_index[name] for name in _PAYROLL_COLUMNS])
+            i_catch_up_contribution = column_index.get('catch_up_contribution')
+            i_catch_up_type = column_index.get('catch_up_type')
+            
+            # Specialize the optional auto-enroll block for this file's shape once,
+            # instead of deciding per row which columns exist
+            optional_names = tuple(name for name in auto_enroll.AUTO_ENROLL_COLUMNS if name in column_index)
+            optional_indices = [column_index[name] for name in optional_names]
+            if len(optional_indices) > 1:
+                get_optional = itemgetter(*optional_indices)
+            elif optional_indices:
+                i_optional = optional_indices[0]
+                get_optional = lambda row: (row[i_optional],)
+            else:
+                get_optional = None
+            
+            # Payroll exports repeat a handful of pay periods across every employee,
+            # so each distinct (start, end) pair is parsed and ISO-formatted once
+            parsed_periods = {}
+            
             records = []
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
+            data_rows = (row for row in reader if row)  # Skip blank lines
+            for row_num, row in enumerate(data_rows, start=2):  # Start at 2 (header is row 1)
+                if len(row) < width:
+                    row += [''] * (width - len(row))
                 try:
-                    # Validate and convert required fields
+                    # Validate and convert required fields (extracted in one C-level call)
+                    employee_id, employee_name, gross_pay, ytd_gross_pay, pay_period_start, pay_period_end = get_required(row)
                     record = {
-                        'employee_id': str(row['employee_id']).strip(),
-                        'employee_name': str(row['employee_name']).strip(),
-                        'gross_pay': _parse_decimal(row['gross_pay'], 'gross_pay', row_num),
-                        'ytd_gross_pay': _parse_decimal(row['ytd_gross_pay'], 'ytd_gross_pay', row_num),
-                        'pay_period_start': _parse_date(row['pay_period_start'], 'pay_period_start', row_num),
-                        'pay_period_end': _parse_date(row['pay_period_end'], 'pay_period_end', row_num),
+                        'employee_id': sys.intern(employee_id.strip()),
+                        'employee_name': employee_name.strip(),
+                        'gross_pay': _parse_cents(gross_pay, 'gross_pay', row_num),
+                        'ytd_gross_pay': _parse_cents(ytd_gross_pay, 'ytd_gross_pay', row_num),
                     }
+                    period = parsed_periods.get((pay_period_start, pay_period_end))
+                    if period is None:
+                        start = _parse_date(pay_period_start, 'pay_period_start', row_num)
+                        end = _parse_date(pay_period_end, 'pay_period_end', row_num)
+                        period = parsed_periods[(pay_period_start, pay_period_end)] = {
+                            'pay_period_start': start,
+                            'pay_period_end': end,
+                            # ISO strings for findings, formatted once here rather than per rule
+                            'pay_period_start_iso': start.isoformat(),
+                            'pay_period_end_iso': end.isoformat(),
+                        }
+                    record.update(period)
                     
                     # Validate optional fields
-                    catch_up_contribution = row.get('catch_up_contribution', '').strip()
+                    catch_up_contribution = row[i_catch_up_contribution].strip() if i_catch_up_contribution is not None else ''
                     if catch_up_contribution:
-                        record['catch_up_contribution'] = _parse_decimal(
+                        record['catch_up_contribution'] = _parse_cents(
                             catch_up_contribution, 'catch_up_contribution', row_num
                         )
                     else:
-                        record['catch_up_contribution'] = Decimal('0')
+                        record['catch_up_contribution'] = 0
                     
-                    catch_up_type = row.get('catch_up_type', '').strip()
+                    catch_up_type = row[i_catch_up_type].strip() if i_catch_up_type is not None else ''
                     if catch_up_type:
-                        if catch_up_type not in ['Roth', 'Traditional']:
+                        # Store the shared constant string, so rule comparisons hit the identity fast path
+                        canonical_type = _CATCH_UP_TYPES.get(catch_up_type)
+                        if canonical_type is None:
                             print(f"Error: Row {row_num}: catch_up_type must be 'Roth' or 'Traditional'", file=sys.stderr)
                             sys.exit(2)
-                        record['catch_up_type'] = catch_up_type
+                        record['catch_up_type'] = canonical_type
                     else:
                         record['catch_up_type'] = None
                     
-                    # Optional auto-enroll fields (added if present in CSV)
-                    if 'hire_date' in reader.fieldnames:
-                        record['hire_date'] = row.get('hire_date', '').strip()
-                    if 'deferral_rate' in reader.fieldnames:
-                        record['deferral_rate'] = row.get('deferral_rate', '').strip()
-                    if 'deferral_start_date' in reader.fieldnames:
-                        record['deferral_start_date'] = row.get('deferral_start_date', '').strip()
+                    # Optional auto-enroll fields (added pre-stripped if present in CSV)
+                    if get_optional is not None:
+                        record.update(zip(optional_names, map(str.strip, get_optional(row))))
                     
                     # Validate dates are in order
                     if record['pay_period_start'] > record['pay_period_end']:
@@ -145,29 +226,38 @@ def load_hours_history(hours_path: Path) -> List[Dict]:
     Raises:
         SystemExit(2): If CSV file cannot be read or is invalid
     """
-    required_columns = ['employee_id', 'year', 'hours']
-    
     try:
         with open(hours_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            fieldnames = next(reader, None)
             
             # Check for required columns
-            if not reader.fieldnames:
+            if not fieldnames:
                 print("Error: Hours history CSV file is empty or has no header row", file=sys.stderr)
                 sys.exit(2)
             
-            missing_columns = [col for col in required_columns if col not in reader.fieldnames]
-            if missing_columns:
+            missing = _HOURS_REQUIRED - set(fieldnames)
+            if missing:
+                missing_columns = [col for col in _HOURS_COLUMNS if col in missing]
                 print(f"Error: Missing required hours history CSV columns: {', '.join(missing_columns)}", file=sys.stderr)
                 sys.exit(2)
             
+            # Read rows as plain lists by column position, as load_payroll_data does
+            column_index = {name: i for i, name in enumerate(fieldnames)}
+            width = len(fieldnames)
+            get_required = itemgetter(*[column_index[name] for name in _HOURS_COLUMNS])
+            
             records = []
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
+            data_rows = (row for row in reader if row)  # Skip blank lines
+            for row_num, row in enumerate(data_rows, start=2):  # Start at 2 (header is row 1)
+                if len(row) < width:
+                    row += [''] * (width - len(row))
                 try:
+                    employee_id, year, hours = get_required(row)
                     record = {
-                        'employee_id': str(row['employee_id']).strip(),
-                        'year': int(row['year']),
-                        'hours': _parse_decimal(row['hours'], 'hours', row_num),
+                        'employee_id': sys.intern(employee_id.strip()),
+                        'year': int(year),
+                        'hours': _parse_float(hours, 'hours', row_num),
                     }
                     
                     # Validate non-negative hours
@@ -192,12 +282,15 @@ def load_hours_history(hours_path: Path) -> List[Dict]:
         sys.exit(2)
 
 
-def write_exception_csv(exceptions: List[Dict], output_path: Path) -> None:
+def write_exception_csv(exceptions: Iterable[Dict], output_path: Path) -> None:
     """
     Write exception records to CSV file.
     
+    Rows are produced lazily from the findings and handed to a single
+    writerows call, so a generator of findings is never materialized in memory.
+    
     Args:
-        exceptions: List of exception dictionaries
+        exceptions: Iterable of exception dictionaries
         output_path: Path to output CSV file
     """
     fieldnames = [
@@ -214,25 +307,30 @@ def write_exception_csv(exceptions: List[Dict], output_path: Path) -> None:
     ]
     
     try:
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+        # 1 MiB buffer: one write() syscall per ~10k rows
+        with open(output_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
             
-            # Add severity to each exception
-            for exc in exceptions:
-                if exc['violation_type'] in ['ROTH_ONLY_CATCHUP_HCE', 'AUTO_ENROLL_MISS']:
-                    exc['severity'] = 'RED'
-                else:
-                    exc['severity'] = 'YELLOW'
-                writer.writerow(exc)
+            # Pull each finding's fields out positionally in one C-level call, adding severity
+            finding_fields = itemgetter(*fieldnames[:-1])
+            writer.writerows(
+                (*finding_fields(exc), 'RED' if exc['violation_type'] in RED_TYPES else 'YELLOW')
+                for exc in exceptions
+            )
     except IOError as e:
         print(f"Error: Cannot write exception CSV file: {e}", file=sys.stderr)
         sys.exit(2)
 
 
-def run_engine(payroll_data: List[Dict], config: Dict, hours_data: Optional[List[Dict]] = None, config_path: Optional[str] = None) -> Tuple[str, int, List[Dict], int, int, Dict]:
+def _plan_rules(
+    payroll_data: List[Dict],
+    config: Dict,
+    hours_data: Optional[List[Dict]],
+    config_path: Optional[str]
+) -> Tuple[Dict, Dict]:
     """
-    Run the preflight engine with all rules.
+    Decide which rules apply.
     
     Args:
         payroll_data: List of payroll records
@@ -241,7 +339,7 @@ def run_engine(payroll_data: List[Dict], config: Dict, hours_data: Optional[List
         config_path: Optional path to config file (for diagnostics)
         
     Returns:
-        Tuple of (status, exit_code, all_findings, violation_count, potential_count, diagnostics)
+        Tuple of (capability flags, diagnostics); the flags say which optional rules run
     """
     # Initialize diagnostics
     diagnostics = {
@@ -253,34 +351,18 @@ def run_engine(payroll_data: List[Dict], config: Dict, hours_data: Optional[List
         'rules_executed': [],
         'rules_skipped': {}
     }
-    
-    # Apply all rules
-    all_findings = []
+    caps = {'auto_enroll': False, 'ltpt': False}
     
     # Rule 1: Roth-only catch-up requirement (RED findings) - Always executed
-    roth_violations = roth_catchup.check_roth_only_catchup_hce(payroll_data, config)
-    all_findings.extend(roth_violations)
-    diagnostics['rules_executed'].append('RothCatchup')
-    
     # Rule 2: Potential HCE detection (YELLOW findings) - Always executed
-    potential_hces = roth_catchup.check_potential_hce(payroll_data, config)
-    all_findings.extend(potential_hces)
-    if 'RothCatchup' not in diagnostics['rules_executed']:
-        diagnostics['rules_executed'].append('RothCatchup')  # Already added, but ensure it's there
+    # Both share one projection pass; Roth violations are emitted first
+    diagnostics['rules_executed'].append('RothCatchup')
     
     # Rule 3: Auto-enrollment and escalation checks
     if diagnostics['auto_enroll_enabled']:
-        # Check if required columns are present
-        if auto_enroll.check_auto_enroll_required_columns(payroll_data):
-            auto_enroll_misses = auto_enroll.check_auto_enroll_miss(payroll_data, config)
-            all_findings.extend(auto_enroll_misses)
-            
-            auto_enroll_below_default = auto_enroll.check_auto_enroll_below_default(payroll_data, config)
-            all_findings.extend(auto_enroll_below_default)
-            
-            escalation_misses = auto_enroll.check_escalation_miss(payroll_data, config)
-            all_findings.extend(escalation_misses)
-            
+        # Check once if required columns are present and hand the result to each rule
+        caps['auto_enroll'] = auto_enroll.check_auto_enroll_required_columns(payroll_data)
+        if caps['auto_enroll']:
             diagnostics['rules_executed'].append('AutoEnroll')
         else:
             diagnostics['rules_skipped']['AutoEnroll'] = 'required columns missing (hire_date, deferral_rate, deferral_start_date)'
@@ -290,30 +372,159 @@ def run_engine(payroll_data: List[Dict], config: Dict, hours_data: Optional[List
     # Rule 4: LTPT eligibility check (YELLOW findings)
     if diagnostics['ltpt_enabled']:
         if diagnostics['hours_file_present']:
-            ltpt_findings = ltpt.check_ltpt_eligibility(payroll_data, hours_data, config)
-            all_findings.extend(ltpt_findings)
+            caps['ltpt'] = True
             diagnostics['rules_executed'].append('LTPT')
         else:
             diagnostics['rules_skipped']['LTPT'] = 'hours_history.csv not found'
     else:
         diagnostics['rules_skipped']['LTPT'] = 'disabled in config'
     
+    return caps, diagnostics
+
+
+def _iter_findings(
+    payroll_data: List[Dict],
+    config: Dict,
+    hours_data: Optional[List[Dict]],
+    caps: Dict
+) -> Iterator[Dict]:
+    """
+    Yield findings from every rule _plan_rules enabled, in output order.
+    
+    Each rule streams its findings lazily, so nothing beyond the rule's own
+    working state is held in memory.
+    """
+    yield from roth_catchup.iter_all(payroll_data, config)
+    if caps['auto_enroll']:
+        yield from auto_enroll.iter_auto_enroll_all(payroll_data, config, caps)
+    if caps['ltpt']:
+        yield from ltpt.iter_ltpt_eligibility(payroll_data, hours_data, config)
+
+
+def _traffic_light(violation_count: int, potential_count: int) -> Tuple[str, int]:
+    """Map RED/YELLOW finding counts to (status, exit_code)."""
+    if violation_count > 0:
+        return "RED", 2
+    if potential_count > 0:
+        return "YELLOW", 0
+    return "GREEN", 0
+
+
+def top_employee_ids(red_ids: List[str], potential_ids: List[str], limit: int = 10) -> List[str]:
+    """
+    Pick the employee IDs to highlight in the run summary.
+    
+    RED finding IDs come first; potential HCE IDs fill any remaining slots.
+    
+    Args:
+        red_ids: Employee IDs of RED findings, in output order
+        potential_ids: Employee IDs of POTENTIAL_HCE findings, in output order
+        limit: Maximum number of IDs to return
+        
+    Returns:
+        List of at most `limit` employee IDs
+    """
+    employee_ids = list(red_ids[:limit])
+    if len(employee_ids) < limit:
+        red_id_set = set(red_ids)
+        for eid in potential_ids:
+            if eid not in red_id_set:
+                employee_ids.append(eid)
+                if len(employee_ids) == limit:
+                    break
+    return employee_ids
+
+
+def run_engine(payroll_data: List[Dict], config: Dict, hours_data: Optional[List[Dict]] = None, config_path: Optional[str] = None) -> Tuple[str, int, List[Dict], int, int, List[Dict], List[Dict], Dict]:
+    """
+    Run the preflight engine with all rules.
+    
+    Args:
+        payroll_data: List of payroll records
+        config: Configuration dictionary
+        hours_data: Optional list of hours history records
+        config_path: Optional path to config file (for diagnostics)
+        
+    Returns:
+        Tuple of (status, exit_code, all_findings, violation_count, potential_count,
+        actual_violations, potential_hces, diagnostics), where actual_violations are
+        the RED findings and potential_hces the POTENTIAL_HCE findings
+    """
+    caps, diagnostics = _plan_rules(payroll_data, config, hours_data, config_path)
+    all_findings = list(_iter_findings(payroll_data, config, hours_data, caps))
+    
     # Count actual violations (RED findings: ROTH_ONLY_CATCHUP_HCE, AUTO_ENROLL_MISS)
-    actual_violations = [v for v in all_findings if v['violation_type'] in ['ROTH_ONLY_CATCHUP_HCE', 'AUTO_ENROLL_MISS']]
+    actual_violations = [v for v in all_findings if v['violation_type'] in RED_TYPES]
     violation_count = len(actual_violations)
     # Count potential issues (YELLOW findings: POTENTIAL_HCE, AUTO_ENROLL_BELOW_DEFAULT, ESCALATION_POSSIBLE_MISS, LTPT_POSSIBLE_ELIGIBLE)
-    potential_count = len([v for v in all_findings if v['violation_type'] in ['POTENTIAL_HCE', 'AUTO_ENROLL_BELOW_DEFAULT', 'ESCALATION_POSSIBLE_MISS', 'LTPT_POSSIBLE_ELIGIBLE']])
+    potential_count = len([v for v in all_findings if v['violation_type'] in YELLOW_TYPES])
+    potential_hces = [v for v in all_findings if v['violation_type'] == 'POTENTIAL_HCE']
     
     # Determine traffic-light status
-    if violation_count > 0:
-        status = "RED"
-        exit_code = 2
-    elif potential_count > 0:
-        status = "YELLOW"
-        exit_code = 0
-    else:
-        status = "GREEN"
-        exit_code = 0
+    status, exit_code = _traffic_light(violation_count, potential_count)
     
     return status, exit_code, all_findings, violation_count, potential_count, actual_violations, potential_hces, diagnostics
 
+
+def run_engine_to_csv(
+    payroll_data: List[Dict],
+    config: Dict,
+    output_path: Path,
+    hours_data: Optional[List[Dict]] = None,
+    config_path: Optional[str] = None
+) -> Tuple[str, int, int, int, List[str], Dict]:
+    """
+    Run the preflight engine, streaming findings straight into the exception CSV.
+    
+    Unlike run_engine, findings are never collected into a list: each one is
+    counted and written as the rules yield it in the same pass that picks the
+    run summary's employee IDs. At most `limit` RED IDs are kept, and POTENTIAL_HCE
+    IDs only until the RED IDs alone fill the summary: the first `limit` distinct
+    IDs not already RED, each at most `limit` times. That is always enough to
+    fill the summary even when later RED findings (auto-enroll misses follow the
+    potential HCEs) knock some of them out.
+    
+    Args:
+        payroll_data: List of payroll records
+        config: Configuration dictionary
+        output_path: Path to output exception CSV file
+        hours_data: Optional list of hours history records
+        config_path: Optional path to config file (for diagnostics)
+        
+    Returns:
+        Tuple of (status, exit_code, violation_count, potential_count, top_employee_ids, diagnostics)
+    """
+    caps, diagnostics = _plan_rules(payroll_data, config, hours_data, config_path)
+    
+    limit = 10
+    violation_count = 0
+    potential_count = 0
+    red_ids = []
+    potential_ids = []
+    potential_kept = {}  # Employee ID -> occurrences in potential_ids
+    
+    def tally(findings: Iterator[Dict]) -> Iterator[Dict]:
+        nonlocal violation_count, potential_count
+        for finding in findings:
+            violation_type = finding['violation_type']
+            if violation_type in RED_TYPES:
+                violation_count += 1
+                if len(red_ids) < limit:
+                    red_ids.append(finding['employee_id'])
+                    if len(red_ids) == limit:
+                        potential_ids.clear()  # RED IDs fill the summary
+            elif violation_type in YELLOW_TYPES:
+                potential_count += 1
+                if violation_type == 'POTENTIAL_HCE' and len(red_ids) < limit:
+                    employee_id = finding['employee_id']
+                    kept = potential_kept.get(employee_id, 0)
+                    if kept < limit and (kept or len(potential_kept) < limit) and employee_id not in red_ids:
+                        potential_kept[employee_id] = kept + 1
+                        potential_ids.append(employee_id)
+            yield finding
+    
+    write_exception_csv(tally(_iter_findings(payroll_data, config, hours_data, caps)), output_path)
+    
+    status, exit_code = _traffic_light(violation_count, potential_count)
+    
+    return status, exit_code, violation_count, potential_count, top_employee_ids(red_ids, potential_ids, limit), diagnostics
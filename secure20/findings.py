@@ -0,0 +1,17 @@
+"""
+Shared finding layout for SECURE 2.0 Preflight rules
+
+Every rule emits findings as dictionaries with the exception CSV columns.
+"""
+
+# Defaults for fields that only some rules populate; rules build findings as
+# {**FINDING_DEFAULTS, ...} and override just the fields they set.
+FINDING_DEFAULTS = {
+    'projected_annual_compensation': 0.0,
+    'catch_up_amount': 0.0,
+    'catch_up_type': '',
+}
+
+# Violation types that fail the run (RED) or only need review (YELLOW)
+RED_TYPES = frozenset({'ROTH_ONLY_CATCHUP_HCE', 'AUTO_ENROLL_MISS'})
+YELLOW_TYPES = frozenset({'POTENTIAL_HCE', 'AUTO_ENROLL_BELOW_DEFAULT', 'ESCALATION_POSSIBLE_MISS', 'LTPT_POSSIBLE_ELIGIBLE'})
@@ -7,9 +7,40 @@ This rule checks for:
 3. Possible escalation misses (YELLOW findings)
 """
 
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 from datetime import date, timedelta
-from typing import Dict, List
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from secure20.findings import FINDING_DEFAULTS
+
+# Optional payroll columns every auto-enroll/escalation check depends on
+AUTO_ENROLL_COLUMNS = ('hire_date', 'deferral_rate', 'deferral_start_date')
+
+
+@lru_cache(maxsize=4096)
+def _parse_rate(rate: str) -> Optional[Decimal]:
+    """Parse a deferral rate string (e.g. "0.03") exactly, or None if blank/invalid; memoized because rates repeat heavily."""
+    if not rate:
+        return None
+    try:
+        value = Decimal(rate)
+    except (InvalidOperation, ValueError, TypeError):
+        return None
+    return value if value.is_finite() else None
+
+
+@lru_cache(maxsize=4096)
+def _iso2ord(value: str) -> int:
+    """Parse a YYYY-MM-DD string to a date ordinal; memoized because payroll exports repeat hire dates heavily."""
+    return date.fromisoformat(value).toordinal()
+
+
+@lru_cache(maxsize=4096)
+def _format_rate(rate: Decimal) -> str:
+    """Format a rate as a percentage with one decimal place (e.g. 0.03 -> "3.0%")."""
+    return f"{rate:.1%}"
 
 
 def check_auto_enroll_required_columns(payroll_data: List[Dict]) -> bool:
@@ -22,220 +53,233 @@ def check_auto_enroll_required_columns(payroll_data: List[Dict]) -> bool:
     Returns:
         True if required columns are present, False otherwise
     """
-    if not payroll_data:
-        return False
-    
-    # Check first record for required columns
-    first_record = payroll_data[0]
-    required = ['hire_date', 'deferral_rate', 'deferral_start_date']
-    
-    # Check if any record has these keys (they might be optional in CSV)
-    for record in payroll_data[:5]:  # Check first few records
-        if all(key in record for key in required):
+    # Check if any of the first few records has these keys (they might be optional in CSV)
+    for record in islice(payroll_data, 5):
+        if all(key in record for key in AUTO_ENROLL_COLUMNS):
             return True
     
     return False
 
 
-def check_auto_enroll_miss(payroll_data: List[Dict], config: Dict) -> List[Dict]:
+def _has_auto_enroll_columns(payroll_data: List[Dict], caps: Optional[Dict]) -> bool:
+    """Use the precomputed capability flag when given, otherwise probe the records."""
+    if caps is None:
+        return check_auto_enroll_required_columns(payroll_data)
+    return caps.get('auto_enroll', False)
+
+
+def _scan_auto_enroll(
+    payroll_data: List[Dict],
+    config: Dict,
+    caps: Optional[Dict],
+    emit_miss: bool,
+    emit_below_default: bool,
+    emit_escalation: bool
+) -> Iterator[Dict]:
     """
-    Check for auto-enrollment misses (RED findings).
+    Evaluate the requested auto-enroll/escalation predicates in one pass.
     
-    Rule: If auto-enroll is enabled and employee should have been auto-enrolled
-    but has no deferral_start_date or deferral_rate is 0.
+    Findings come out grouped by rule (misses, then below default, then
+    escalation misses). The first requested rule streams as records are
+    scanned; only the later ones are buffered until the pass ends.
     
     Args:
         payroll_data: List of payroll records
         config: Configuration dictionary
+        caps: Optional capability flags from run_engine; probed when omitted
+        emit_miss: Evaluate the auto-enrollment miss rule
+        emit_below_default: Evaluate the below default rate rule
+        emit_escalation: Evaluate the possible escalation miss rule
         
-    Returns:
-        List of violation dictionaries for exception CSV
+    Yields:
+        Finding dictionaries for exception CSV
     """
-    findings = []
+    # Check if required columns exist
+    if not _has_auto_enroll_columns(payroll_data, caps):
+        return
     
-    # Check if rule is enabled
-    if not config.get('auto_enroll_enabled', False):
-        return findings
+    emit_miss = emit_miss and config.get('auto_enroll_enabled', False)
+    emit_escalation = emit_escalation and config.get('escalation_enabled', False)
+    check_rate = emit_below_default or emit_escalation
+    if not emit_miss and not check_rate:
+        return
     
-    # Check if required columns exist
-    if not check_auto_enroll_required_columns(payroll_data):
-        return findings
+    # Whole days, as date + timedelta would apply them
+    wait_days = timedelta(days=config.get('auto_enroll_wait_days', 0)).days
+    escalation_effective_month = config.get('escalation_effective_month', 1)
+    default_rate = Decimal(str(config.get('auto_enroll_default_rate', 0.03)))
+    default_rate_text = _format_rate(default_rate)
+    
+    # Only rules that follow a streamed rule in output order need buffering
+    below_default = []
+    escalation_misses = []
+    stream_below_default = not emit_miss
+    stream_escalation = not emit_miss and not emit_below_default
     
-    wait_days = config.get('auto_enroll_wait_days', 0)
-    current_year = config.get('hce_threshold', {}).get('current_year', 2024)
+    # Bind hot-loop helpers to locals (LOAD_FAST instead of global/attribute lookups)
+    add_below_default = below_default.append
+    add_escalation_miss = escalation_misses.append
+    iso2ord = _iso2ord
+    parse_rate = _parse_rate
+    format_rate = _format_rate
+    defaults = FINDING_DEFAULTS
     
     for record in payroll_data:
-        # Check if employee has hire_date
-        hire_date_str = record.get('hire_date', '').strip()
-        if not hire_date_str:
-            continue
-        
-        try:
-            # Parse hire_date (assuming YYYY-MM-DD format)
-            hire_date = date.fromisoformat(hire_date_str)
-        except (ValueError, TypeError):
-            continue
-        
-        # Check if pay_period_end is >= hire_date + wait_days
         pay_period_end = record['pay_period_end']
-        enrollment_date = hire_date + timedelta(days=wait_days)
-        
-        if pay_period_end < enrollment_date:
-            continue  # Not yet eligible for auto-enrollment
-        
-        # Check deferral status
+        # Records may be hand-built rather than loader-stripped, so tolerate
+        # missing keys and surrounding whitespace as the per-rule checks always have.
+        # Every rule treats a missing deferral start date as not enrolled, so the
+        # rate is only parsed for enrolled employees.
         deferral_start_date_str = record.get('deferral_start_date', '').strip()
-        deferral_rate_str = record.get('deferral_rate', '').strip()
+        deferral_rate = parse_rate(record.get('deferral_rate', '').strip()) if deferral_start_date_str else None
         
-        deferral_rate = Decimal('0')
-        if deferral_rate_str:
+        if emit_miss:
+            hire_date_str = record.get('hire_date', '').strip()
             try:
-                deferral_rate = Decimal(deferral_rate_str)
+                # Parse hire_date (assuming YYYY-MM-DD format)
+                hire_ord = iso2ord(hire_date_str) if hire_date_str else None
             except (ValueError, TypeError):
-                pass
+                hire_ord = None
+            
+            if hire_ord is not None:
+                # Compare day ordinals rather than building a date per record
+                enrollment_ord = hire_ord + wait_days
+                
+                # Auto-enrollment should have occurred (pay_period_end >= hire_date + wait days) but didn't
+                if pay_period_end.toordinal() >= enrollment_ord and not deferral_rate:
+                    yield {
+                        **defaults,
+                        'employee_id': record['employee_id'],
+                        'employee_name': record['employee_name'],
+                        'violation_type': 'AUTO_ENROLL_MISS',
+                        'violation_description': (
+                            f"Auto-enrollment miss: Employee hired {hire_date_str}, eligible from {date.fromordinal(enrollment_ord).isoformat()}, "
+                            f"but no deferral start date or deferral rate is 0"
+                        ),
+                        'pay_period_start': record['pay_period_start_iso'],
+                        'pay_period_end': record['pay_period_end_iso'],
+                    }
+        
+        # The remaining checks only apply to enrolled employees below the default rate
+        # (compared exactly, so e.g. 0.02999 stays below a 3% default)
+        if not check_rate or deferral_rate is None or deferral_rate >= default_rate:
+            continue
         
-        # Check if auto-enrollment should have occurred but didn't
-        if not deferral_start_date_str or deferral_rate == 0:
+        deferral_rate_text = format_rate(deferral_rate)
+        if emit_below_default:
             finding = {
+                **defaults,
                 'employee_id': record['employee_id'],
                 'employee_name': record['employee_name'],
-                'violation_type': 'AUTO_ENROLL_MISS',
+                'violation_type': 'AUTO_ENROLL_BELOW_DEFAULT',
                 'violation_description': (
-                    f"Auto-enrollment miss: Employee hired {hire_date_str}, eligible from {enrollment_date.strftime('%Y-%m-%d')}, "
-                    f"but no deferral start date or deferral rate is 0"
+                    f"Auto-enrolled employee below default rate: deferral_rate={deferral_rate_text}, "
+                    f"default={default_rate_text}"
                 ),
-                'projected_annual_compensation': 0.0,
-                'catch_up_amount': 0.0,
-                'catch_up_type': '',
-                'pay_period_start': record['pay_period_start'].strftime('%Y-%m-%d'),
-                'pay_period_end': record['pay_period_end'].strftime('%Y-%m-%d'),
+                'pay_period_start': record['pay_period_start_iso'],
+                'pay_period_end': record['pay_period_end_iso'],
             }
-            findings.append(finding)
-    
-    return findings
-
-
-def check_auto_enroll_below_default(payroll_data: List[Dict], config: Dict) -> List[Dict]:
-    """
-    Check for auto-enrolled employees below default rate (YELLOW findings).
-    
-    Rule: If employee is auto-enrolled but deferral_rate is below default.
-    
-    Args:
-        payroll_data: List of payroll records
-        config: Configuration dictionary
-        
-    Returns:
-        List of violation dictionaries for exception CSV
-    """
-    findings = []
-    
-    # Check if required columns exist
-    if not check_auto_enroll_required_columns(payroll_data):
-        return findings
-    
-    default_rate = Decimal(str(config.get('auto_enroll_default_rate', 0.03)))
-    
-    for record in payroll_data:
-        deferral_start_date_str = record.get('deferral_start_date', '').strip()
-        if not deferral_start_date_str:
-            continue  # Not auto-enrolled
-        
-        deferral_rate_str = record.get('deferral_rate', '').strip()
-        if not deferral_rate_str:
-            continue
-        
-        try:
-            deferral_rate = Decimal(deferral_rate_str)
-        except (ValueError, TypeError):
-            continue
+            if stream_below_default:
+                yield finding
+            else:
+                add_below_default(finding)
         
-        # Check if rate is below default
-        if deferral_rate < default_rate:
+        # Rate is still below default after escalation should have occurred (same year)
+        if emit_escalation and pay_period_end.month >= escalation_effective_month:
             finding = {
+                **defaults,
                 'employee_id': record['employee_id'],
                 'employee_name': record['employee_name'],
-                'violation_type': 'AUTO_ENROLL_BELOW_DEFAULT',
+                'violation_type': 'ESCALATION_POSSIBLE_MISS',
                 'violation_description': (
-                    f"Auto-enrolled employee below default rate: deferral_rate={deferral_rate:.1%}, "
-                    f"default={default_rate:.1%}"
+                    f"Possible escalation miss detected: deferral_rate={deferral_rate_text} is below default={default_rate_text} "
+                    f"after escalation effective month ({escalation_effective_month}). This may indicate an escalation issue; "
+                    f"please verify plan schedule and employee election history to confirm."
                 ),
-                'projected_annual_compensation': 0.0,
-                'catch_up_amount': 0.0,
-                'catch_up_type': '',
-                'pay_period_start': record['pay_period_start'].strftime('%Y-%m-%d'),
-                'pay_period_end': record['pay_period_end'].strftime('%Y-%m-%d'),
+                'pay_period_start': record['pay_period_start_iso'],
+                'pay_period_end': record['pay_period_end_iso'],
             }
-            findings.append(finding)
+            if stream_escalation:
+                yield finding
+            else:
+                add_escalation_miss(finding)
     
-    return findings
+    yield from below_default
+    yield from escalation_misses
 
 
-def check_escalation_miss(payroll_data: List[Dict], config: Dict) -> List[Dict]:
+def iter_auto_enroll_all(payroll_data: List[Dict], config: Dict, caps: Optional[Dict] = None) -> Iterator[Dict]:
     """
-    Check for possible escalation misses (YELLOW findings).
+    Yield all three auto-enroll/escalation checks from a single pass over payroll data.
     
-    Rule: If escalation is enabled and employee should have escalated
-    but deferral_rate is still below default rate.
+    Each record's hire date, deferral start date and deferral rate are read
+    once and shared by the three predicates:
+    
+    - Auto-enrollment miss (RED): auto-enroll is enabled, pay_period_end is on
+      or after hire_date + wait days, but there is no deferral_start_date or
+      deferral_rate is 0.
+    - Below default (YELLOW): employee is auto-enrolled but deferral_rate is
+      below the default rate.
+    - Possible escalation miss (YELLOW): escalation is enabled, pay_period_end
+      is in or after the escalation effective month, and an enrolled employee's
+      deferral_rate is still below the default rate.
+    
+    Misses stream as they are found; the two YELLOW rules follow in that order.
     
     Args:
         payroll_data: List of payroll records
         config: Configuration dictionary
+        caps: Optional capability flags from run_engine (e.g. {'auto_enroll': True});
+            probed from payroll_data when omitted
         
-    Returns:
-        List of violation dictionaries for exception CSV
+    Yields:
+        Finding dictionaries for exception CSV
     """
-    findings = []
-    
-    # Check if rule is enabled
-    if not config.get('escalation_enabled', False):
-        return findings
-    
-    # Check if required columns exist
-    if not check_auto_enroll_required_columns(payroll_data):
-        return findings
-    
-    escalation_effective_month = config.get('escalation_effective_month', 1)
-    default_rate = Decimal(str(config.get('auto_enroll_default_rate', 0.03)))
-    
-    for record in payroll_data:
-        deferral_start_date_str = record.get('deferral_start_date', '').strip()
-        if not deferral_start_date_str:
-            continue  # Not enrolled, skip escalation check
-        
-        pay_period_end = record['pay_period_end']
-        
-        # Check if pay_period_end month is >= escalation_effective_month (same year)
-        if pay_period_end.month < escalation_effective_month:
-            continue  # Not yet in escalation period
-        
-        deferral_rate_str = record.get('deferral_rate', '').strip()
-        if not deferral_rate_str:
-            continue
-        
-        try:
-            deferral_rate = Decimal(deferral_rate_str)
-        except (ValueError, TypeError):
-            continue
-        
-        # Check if rate is still below default after escalation should have occurred
-        if deferral_rate < default_rate:
-            finding = {
-                'employee_id': record['employee_id'],
-                'employee_name': record['employee_name'],
-                'violation_type': 'ESCALATION_POSSIBLE_MISS',
-                'violation_description': (
-                    f"Possible escalation miss detected: deferral_rate={deferral_rate:.1%} is below default={default_rate:.1%} "
-                    f"after escalation effective month ({escalation_effective_month}). This may indicate an escalation issue; "
-                    f"please verify plan schedule and employee election history to confirm."
-                ),
-                'projected_annual_compensation': 0.0,
-                'catch_up_amount': 0.0,
-                'catch_up_type': '',
-                'pay_period_start': record['pay_period_start'].strftime('%Y-%m-%d'),
-                'pay_period_end': record['pay_period_end'].strftime('%Y-%m-%d'),
-            }
-            findings.append(finding)
+    return _scan_auto_enroll(payroll_data, config, caps, True, True, True)
+
+
+def check_auto_enroll_all(
+    payroll_data: List[Dict],
+    config: Dict,
+    caps: Optional[Dict] = None
+) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    Run all three auto-enroll/escalation checks in a single pass (see iter_auto_enroll_all).
     
-    return findings
+    Returns:
+        Tuple of (auto-enroll misses, below-default findings, escalation misses)
+    """
+    findings = {'AUTO_ENROLL_MISS': [], 'AUTO_ENROLL_BELOW_DEFAULT': [], 'ESCALATION_POSSIBLE_MISS': []}
+    for finding in iter_auto_enroll_all(payroll_data, config, caps):
+        findings[finding['violation_type']].append(finding)
+    return findings['AUTO_ENROLL_MISS'], findings['AUTO_ENROLL_BELOW_DEFAULT'], findings['ESCALATION_POSSIBLE_MISS']
+
+
+def iter_auto_enroll_miss(payroll_data: List[Dict], config: Dict, caps: Optional[Dict] = None) -> Iterator[Dict]:
+    """Yield auto-enrollment misses (RED findings); see iter_auto_enroll_all for the rule."""
+    return _scan_auto_enroll(payroll_data, config, caps, True, False, False)
+
+
+def check_auto_enroll_miss(payroll_data: List[Dict], config: Dict, caps: Optional[Dict] = None) -> List[Dict]:
+    """Check for auto-enrollment misses (RED findings); see iter_auto_enroll_all for the rule."""
+    return list(iter_auto_enroll_miss(payroll_data, config, caps))
+
+
+def iter_auto_enroll_below_default(payroll_data: List[Dict], config: Dict, caps: Optional[Dict] = None) -> Iterator[Dict]:
+    """Yield auto-enrolled employees below default rate (YELLOW findings); see iter_auto_enroll_all."""
+    return _scan_auto_enroll(payroll_data, config, caps, False, True, False)
+
+
+def check_auto_enroll_below_default(payroll_data: List[Dict], config: Dict, caps: Optional[Dict] = None) -> List[Dict]:
+    """Check for auto-enrolled employees below default rate (YELLOW findings); see iter_auto_enroll_all."""
+    return list(iter_auto_enroll_below_default(payroll_data, config, caps))
+
+
+def iter_escalation_miss(payroll_data: List[Dict], config: Dict, caps: Optional[Dict] = None) -> Iterator[Dict]:
+    """Yield possible escalation misses (YELLOW findings); see iter_auto_enroll_all for the rule."""
+    return _scan_auto_enroll(payroll_data, config, caps, False, False, True)
+
 
+def check_escalation_miss(payroll_data: List[Dict], config: Dict, caps: Optional[Dict] = None) -> List[Dict]:
+    """Check for possible escalation misses (YELLOW findings); see iter_auto_enroll_all for the rule."""
+    return list(iter_escalation_miss(payroll_data, config, caps))
@@ -4,181 +4,388 @@ Roth Catch-up Rule for SECURE 2.0 Preflight Checker
 This rule checks for:
 1. HCEs subject to Roth-only catch-up requirement (RED findings)
 2. Potential HCEs based on projected compensation (YELLOW findings)
+
+Monetary record fields are integer cents (see engine.load_payroll_data), so
+projections are in cents; config thresholds and finding amounts are dollars.
+Records always carry catch_up_contribution (0 when blank) and catch_up_type
+(None when blank), so they are read directly rather than with defaults.
+
+The module imports only the standard library, is fully annotated and
+passes plain mypy (checked by the test suite), so it can be compiled with
+mypyc as-is; the plain .py source remains the default.
 """
 
-from decimal import Decimal
 from datetime import date
-from typing import Dict, List, Tuple
+from functools import lru_cache, partial
+from typing import Callable, Dict, Iterator, List, NamedTuple, Tuple, Union
+
+
+# Supported projection_method values; anything else falls back to legacy
+PROJECTION_METHODS = ('legacy', 'ytd_annualize', 'period_annualize', 'blend', 'conservative_max')
+
+# Finding descriptions; the Roth template takes the projected dollars, the
+# potential HCE template takes the projection method suffix and projected dollars
+_ROTH_MSG_TMPL = (
+    "Catch-up contributions must be Roth for this projected HCE under SECURE 2.0 (Roth-only requirement). "
+    "Review payroll enforcement. Projected annual compensation: ${:,.2f}"
+)
+_POTENTIAL_MSG_TMPL = "Potential HCE{} based on projected annual compensation: ${:,.2f}"
+
+# Projection kernel method codes; legacy resolves to GROSS or YTD_OR_GROSS by annualization.method
+METHOD_GROSS, METHOD_YTD_OR_GROSS, METHOD_PERIOD, METHOD_YTD, METHOD_BLEND, METHOD_MAX = range(6)
+
+# Projection kernel signature: scalar columns in (gross cents, YTD cents, days
+# elapsed, period days), projected cents out
+ProjectionKernel = Callable[[List[int], List[int], List[int], List[int]], List[float]]
 
+# Projection method name -> kernel method code (legacy is resolved separately)
+_METHOD_CODES: Dict[str, int] = {
+    'ytd_annualize': METHOD_YTD,
+    'period_annualize': METHOD_PERIOD,
+    'blend': METHOD_BLEND,
+    'conservative_max': METHOD_MAX,
+}
 
-def annualize_compensation(record: Dict, config: Dict) -> Tuple[Decimal, str]:
+# Pay periods per year indexed by pay period length in days (0-63; longer periods
+# use the biweekly default). Overlapping ranges resolve in this priority order, so
+# 14-15 day periods are biweekly and only 16-17 day periods count as semi-monthly.
+_PERIODS_PER_YEAR: List[int] = [26] * 64  # Default to biweekly
+for _days in range(28, 33):  # ~30 days (monthly)
+    _PERIODS_PER_YEAR[_days] = 12
+for _days in range(14, 18):  # ~15-16 days (semi-monthly)
+    _PERIODS_PER_YEAR[_days] = 24
+for _days in range(6, 9):  # ~7 days (weekly)
+    _PERIODS_PER_YEAR[_days] = 52
+for _days in range(13, 16):  # ~14 days (biweekly)
+    _PERIODS_PER_YEAR[_days] = 26
+del _days
+
+
+class CompiledConfig(NamedTuple):
+    """Config settings the Roth catch-up checks need, resolved once before looping over records."""
+    method_code: int
+    projection_method: str
+    project: ProjectionKernel  # Kernel specialized for method_code
+    year_start_ord: int
+    threshold: int  # HCE compensation limit, in whole cents
+    weight_ytd: float
+    weight_period: float
+    current_year: int
+    roth_only_risk_year: int
+
+
+def compile_config(config: Union[Dict, CompiledConfig]) -> CompiledConfig:
     """
-    Calculate projected annual compensation for an employee.
+    Resolve the loop-invariant settings from a configuration dictionary.
+    
+    The checks accept either form; compiling once up front saves repeating
+    this for every call when the same config is checked many times.
+    
+    The projection kernel is picked here, once: projection_method selects
+    its kernel directly, and legacy selects by annualization.method (ytd and
+    gross_or_ytd project from YTD pay falling back to gross, gross always
+    projects from gross pay), so no method is compared per record or batch.
     
     Args:
-        record: Payroll record dictionary
-        config: Configuration dictionary
+        config: Configuration dictionary (a CompiledConfig is returned as-is)
         
     Returns:
-        Tuple of (projected annual compensation amount, projection method name)
+        CompiledConfig for config
     """
-    # Check for new projection_method config (defaults to legacy if not present)
-    projection_method = config.get('projection_method', 'legacy')
-    
-    if projection_method == 'legacy':
-        return _annualize_legacy(record, config), 'legacy'
-    elif projection_method == 'ytd_annualize':
-        return _annualize_ytd(record, config), 'ytd_annualize'
-    elif projection_method == 'period_annualize':
-        return _annualize_period(record, config), 'period_annualize'
-    elif projection_method == 'blend':
-        return _annualize_blend(record, config), 'blend'
-    elif projection_method == 'conservative_max':
-        return _annualize_conservative_max(record, config), 'conservative_max'
+    if isinstance(config, CompiledConfig):
+        return config
+    method_code, projection_method = _resolve_method(config)
+    weight_ytd = float(config.get('blend_weight_ytd', 0.85))
+    weight_period = float(config.get('blend_weight_period', 0.15))
+    project: ProjectionKernel
+    if method_code == METHOD_BLEND:
+        project = partial(_project_blend, weight_ytd=weight_ytd, weight_period=weight_period)
     else:
-        # Unknown method, fall back to legacy
-        return _annualize_legacy(record, config), 'legacy'
+        project = _KERNELS[method_code]
+    return CompiledConfig(
+        method_code=method_code,
+        projection_method=projection_method,
+        project=project,
+        year_start_ord=date(config['hce_threshold']['current_year'], 1, 1).toordinal(),
+        threshold=round(float(config['hce_threshold']['compensation_limit']) * 100),
+        weight_ytd=weight_ytd,
+        weight_period=weight_period,
+        current_year=config['hce_threshold']['current_year'],
+        roth_only_risk_year=config['catch_up']['roth_only_risk_year'],
+    )
 
 
-def _annualize_legacy(record: Dict, config: Dict) -> Decimal:
-    """Legacy annualization method (original behavior)."""
-    method = config['annualization']['method']
-    current_year = config['hce_threshold']['current_year']
-    
-    # Calculate days elapsed in year for YTD projection
-    year_start = date(current_year, 1, 1)
-    pay_period_end = record['pay_period_end']
-    days_elapsed = (pay_period_end - year_start).days + 1  # +1 to include end date
-    if days_elapsed <= 0:
-        days_elapsed = 1  # Prevent division by zero
-    
-    # Method: ytd - always use YTD projection if available
-    if method == 'ytd':
-        if record['ytd_gross_pay'] > 0:
-            return record['ytd_gross_pay'] * Decimal('365') / Decimal(str(days_elapsed))
-        else:
-            # Fallback to gross if YTD is zero/not available
-            return _annualize_from_gross(record)
-    
-    # Method: gross_or_ytd - prefer YTD if available, otherwise use gross
-    if method == 'gross_or_ytd':
-        if record['ytd_gross_pay'] > 0:
-            return record['ytd_gross_pay'] * Decimal('365') / Decimal(str(days_elapsed))
-        else:
-            return _annualize_from_gross(record)
-    
-    # Method: gross - always annualize from gross pay
-    if method == 'gross':
-        return _annualize_from_gross(record)
-    
-    # Should not reach here, but default to gross_or_ytd behavior
-    return _annualize_from_gross(record)
+def _roth_only_applies(config: Union[Dict, CompiledConfig]) -> bool:
+    """Whether the Roth-only catch-up requirement applies (current_year >= roth_only_risk_year)."""
+    if isinstance(config, CompiledConfig):
+        return config.current_year >= config.roth_only_risk_year
+    return config['hce_threshold']['current_year'] >= config['catch_up']['roth_only_risk_year']
 
 
-def _annualize_ytd(record: Dict, config: Dict) -> Decimal:
-    """YTD annualization: (ytd_gross_pay / days_elapsed) * 365"""
-    current_year = config['hce_threshold']['current_year']
-    year_start = date(current_year, 1, 1)
-    pay_period_end = record['pay_period_end']
-    days_elapsed = (pay_period_end - year_start).days + 1
-    
-    if days_elapsed <= 0:
-        days_elapsed = 1
-    
-    ytd_gross = record.get('ytd_gross_pay', Decimal('0'))
-    if ytd_gross <= 0:
-        # Fallback to period annualization if YTD is missing/zero
-        return _annualize_period(record, config)
+def annualize_compensation(record: Dict, config: Union[Dict, CompiledConfig]) -> Tuple[float, str]:
+    """
+    Calculate projected annual compensation for an employee.
     
-    return (ytd_gross / Decimal(str(days_elapsed))) * Decimal('365')
+    Args:
+        record: Payroll record dictionary
+        config: Configuration dictionary, or a CompiledConfig from compile_config
+        
+    Returns:
+        Tuple of (projected annual compensation in cents, projection method name)
+    """
+    projections, projection_method = annualize_batch([record], config)
+    return projections[0], projection_method
 
 
-def _annualize_period(record: Dict, config: Dict) -> Decimal:
-    """Period annualization: gross_pay * periods_per_year"""
-    pay_period_start = record['pay_period_start']
-    pay_period_end = record['pay_period_end']
-    gross_pay = record['gross_pay']
-    
-    # Calculate pay period length in days
-    pay_period_days = (pay_period_end - pay_period_start).days + 1
-    if pay_period_days <= 0:
-        pay_period_days = 1
+def annualize_batch(payroll_data: List[Dict], config: Union[Dict, CompiledConfig]) -> Tuple[List[float], str]:
+    """
+    Project annual compensation for every record in one columnar pass.
     
-    # Infer periods per year based on period length
-    if 13 <= pay_period_days <= 15:  # ~14 days (biweekly)
-        periods_per_year = 26
-    elif 6 <= pay_period_days <= 8:  # ~7 days (weekly)
-        periods_per_year = 52
-    elif 14 <= pay_period_days <= 17:  # ~15-16 days (semi-monthly)
-        periods_per_year = 24
-    elif 28 <= pay_period_days <= 32:  # ~30 days (monthly)
-        periods_per_year = 12
-    else:
-        # Default to biweekly
-        periods_per_year = 26
+    The inputs are pulled out of the record dicts once into parallel columns
+    (integer cents and day counts) and handed to the projection kernel that
+    compile_config picked for the configured method, so nothing is resolved
+    per record.
     
-    return gross_pay * Decimal(str(periods_per_year))
+    Args:
+        payroll_data: List of payroll records
+        config: Configuration dictionary, or a CompiledConfig from compile_config
+        
+    Returns:
+        Tuple of (projected annual compensation in cents per record, projection method name)
+    """
+    ctx = compile_config(config)
+    return _project(payroll_data, ctx), ctx.projection_method
+
+
+def _project(payroll_data: List[Dict], ctx: CompiledConfig) -> List[float]:
+    """Project annual compensation (cents) for each record using a prebuilt context."""
+    gross, ytd, days_elapsed, period_days = _extract_columns(payroll_data, ctx.year_start_ord)
+    return ctx.project(gross, ytd, days_elapsed, period_days)
 
 
-def _annualize_blend(record: Dict, config: Dict) -> Decimal:
-    """Blend annualization: weighted combination of YTD and period methods"""
-    weight_ytd = Decimal(str(config.get('blend_weight_ytd', 0.85)))
-    weight_period = Decimal(str(config.get('blend_weight_period', 0.15)))
+def _resolve_method(config: Dict) -> Tuple[int, str]:
+    """
+    Resolve the configured projection method to a kernel method code.
     
-    ytd_proj = _annualize_ytd(record, config)
-    period_proj = _annualize_period(record, config)
+    Returns:
+        Tuple of (METHOD_* code, projection method name used in findings)
+    """
+    # Check for new projection_method config (defaults to legacy if not present or unknown)
+    projection_method = config.get('projection_method', 'legacy')
+    if projection_method not in PROJECTION_METHODS:
+        projection_method = 'legacy'
     
-    return (weight_ytd * ytd_proj) + (weight_period * period_proj)
+    if projection_method == 'legacy':
+        # Methods ytd / gross_or_ytd prefer YTD; gross (or anything else) uses gross pay
+        if config['annualization']['method'] in ('ytd', 'gross_or_ytd'):
+            return METHOD_YTD_OR_GROSS, projection_method
+        return METHOD_GROSS, projection_method
+    return _METHOD_CODES[projection_method], projection_method
 
 
-def _annualize_conservative_max(record: Dict, config: Dict) -> Decimal:
-    """Conservative max annualization: max(ytd_annualize, period_annualize)"""
-    projected_ytd = _annualize_ytd(record, config)
-    projected_period = _annualize_period(record, config)
+@lru_cache(maxsize=4096)
+def _calendar_days(pay_period_start: date, pay_period_end: date, year_start_ord: int) -> Tuple[int, int]:
+    """
+    Day counts for one pay period, cached since most of a payroll shares a few pay calendars.
     
-    return max(projected_ytd, projected_period)
+    Returns:
+        Tuple of (pay period days, days elapsed in year), each at least 1
+    """
+    end = pay_period_end.toordinal()
+    # Pay period length in days (+1 to include both dates; at least 1 to prevent division by zero)
+    # Days elapsed in year for YTD projection (+1 to include end date; at least 1)
+    return max(end - pay_period_start.toordinal() + 1, 1), max(end - year_start_ord + 1, 1)
 
 
-def _annualize_conservative_max(record: Dict, config: Dict) -> Decimal:
-    """Conservative max annualization: max(ytd_annualize, period_annualize)"""
-    projected_ytd = _annualize_ytd(record, config)
-    projected_period = _annualize_period(record, config)
+def _extract_columns(
+    payroll_data: List[Dict],
+    year_start_ord: int
+) -> Tuple[List[int], List[int], List[int], List[int]]:
+    """
+    Pull the projection inputs out of the records into parallel columns.
     
-    return max(projected_ytd, projected_period)
+    Returns:
+        Tuple of (gross_pay cents, ytd_gross_pay cents, days elapsed in year, pay period days)
+    """
+    gross = [record['gross_pay'] for record in payroll_data]
+    ytd = [record['ytd_gross_pay'] for record in payroll_data]
+    # Records on the same pay calendar share their day counts
+    calendar = [_calendar_days(record['pay_period_start'], record['pay_period_end'], year_start_ord)
+                for record in payroll_data]
+    period_days = [days[0] for days in calendar]
+    days_elapsed = [days[1] for days in calendar]
+    return gross, ytd, days_elapsed, period_days
 
 
-def _annualize_from_gross(record: Dict) -> Decimal:
-    """Annualize compensation from gross pay based on pay period frequency."""
-    pay_period_start = record['pay_period_start']
-    pay_period_end = record['pay_period_end']
-    gross_pay = record['gross_pay']
-    
-    # Calculate pay period length in days
-    pay_period_days = (pay_period_end - pay_period_start).days + 1  # +1 to include both dates
-    if pay_period_days <= 0:
-        pay_period_days = 1  # Prevent division by zero
-    
-    # Annualize: gross_pay * (365 / pay_period_days)
-    return gross_pay * Decimal('365') / Decimal(str(pay_period_days))
+# Specialized projection kernels, one per METHOD_* code (see ProjectionKernel).
+# They work only on ints/floats (no dicts, strings or Decimal), and
+# compile_config picks one per config so no method dispatch happens per batch.
+def _project_gross(gross: List[int], ytd: List[int], days_elapsed: List[int], period_days: List[int]) -> List[float]:
+    """Always annualize from gross pay: gross_pay * (365 / pay_period_days)."""
+    return [g * 365 / d for g, d in zip(gross, period_days)]
+
 
+def _project_ytd_or_gross(gross: List[int], ytd: List[int], days_elapsed: List[int], period_days: List[int]) -> List[float]:
+    """YTD projection if available, otherwise gross."""
+    return [y * 365 / e if y > 0 else g * 365 / d
+            for y, e, g, d in zip(ytd, days_elapsed, gross, period_days)]
 
-def is_hce(record: Dict, config: Dict) -> bool:
+
+def _project_period(gross: List[int], ytd: List[int], days_elapsed: List[int], period_days: List[int]) -> List[float]:
+    """Period annualization: gross_pay * periods_per_year (inferred from period length)."""
+    lut = _PERIODS_PER_YEAR
+    return [g * (lut[d] if d < 64 else 26) for g, d in zip(gross, period_days)]
+
+
+def _ytd_over_period(ytd: List[int], days_elapsed: List[int], period: List[float]) -> List[float]:
+    """YTD annualization: (ytd_gross_pay / days_elapsed) * 365, falling back to period if YTD is missing/zero."""
+    return [y * 365 / e if y > 0 else p for y, e, p in zip(ytd, days_elapsed, period)]
+
+
+def _project_ytd(gross: List[int], ytd: List[int], days_elapsed: List[int], period_days: List[int]) -> List[float]:
+    """YTD annualization with period fallback."""
+    return _ytd_over_period(ytd, days_elapsed, _project_period(gross, ytd, days_elapsed, period_days))
+
+
+def _project_blend(
+    gross: List[int],
+    ytd: List[int],
+    days_elapsed: List[int],
+    period_days: List[int],
+    weight_ytd: float,
+    weight_period: float
+) -> List[float]:
+    """Weighted combination of YTD and period methods (weights bound by compile_config)."""
+    period = _project_period(gross, ytd, days_elapsed, period_days)
+    ytd_projection = _ytd_over_period(ytd, days_elapsed, period)
+    return [weight_ytd * y + weight_period * p for y, p in zip(ytd_projection, period)]
+
+
+def _project_max(gross: List[int], ytd: List[int], days_elapsed: List[int], period_days: List[int]) -> List[float]:
+    """Conservative max: max(ytd_annualize, period_annualize)."""
+    period = _project_period(gross, ytd, days_elapsed, period_days)
+    ytd_projection = _ytd_over_period(ytd, days_elapsed, period)
+    return [max(y, p) for y, p in zip(ytd_projection, period)]
+
+
+_KERNELS: Dict[int, ProjectionKernel] = {
+    METHOD_GROSS: _project_gross,
+    METHOD_YTD_OR_GROSS: _project_ytd_or_gross,
+    METHOD_PERIOD: _project_period,
+    METHOD_YTD: _project_ytd,
+    METHOD_MAX: _project_max,
+}
+
+
+def is_hce(record: Dict, config: Union[Dict, CompiledConfig]) -> bool:
     """
     Determine if an employee is a Highly Compensated Employee (HCE).
     
     Args:
         record: Payroll record dictionary
-        config: Configuration dictionary
+        config: Configuration dictionary, or a CompiledConfig from compile_config
         
     Returns:
         True if employee is an HCE, False otherwise
     """
-    projected_compensation, _ = annualize_compensation(record, config)
-    threshold = Decimal(str(config['hce_threshold']['compensation_limit']))
-    return projected_compensation >= threshold
+    ctx = compile_config(config)
+    return _project([record], ctx)[0] >= ctx.threshold
+
+
+def _roth_finding(record: Dict, projected_comp: float) -> Dict:
+    """
+    Build a Roth-only catch-up violation for an HCE record.
+    
+    Args:
+        record: Payroll record dictionary
+        projected_comp: Projected annual compensation in cents
+        
+    Returns:
+        Violation dictionary for exception CSV
+    """
+    projected_comp /= 100
+    return {
+        'employee_id': record['employee_id'],
+        'employee_name': record['employee_name'],
+        'violation_type': 'ROTH_ONLY_CATCHUP_HCE',
+        'violation_description': _ROTH_MSG_TMPL.format(projected_comp),
+        'projected_annual_compensation': projected_comp,
+        'catch_up_amount': record['catch_up_contribution'] / 100,
+        'catch_up_type': record['catch_up_type'],
+        'pay_period_start': record['pay_period_start_iso'],
+        'pay_period_end': record['pay_period_end_iso'],
+    }
+
+
+def _potential_finding(record: Dict, projected_comp: float, method_text: str) -> Dict:
+    """
+    Build a potential HCE finding for a record at or above the threshold.
+    
+    Args:
+        record: Payroll record dictionary
+        projected_comp: Projected annual compensation in cents
+        method_text: Projection method suffix for the description
+        
+    Returns:
+        Potential HCE record for exception CSV (informational)
+    """
+    projected_comp /= 100
+    return {
+        'employee_id': record['employee_id'],
+        'employee_name': record['employee_name'],
+        'violation_type': 'POTENTIAL_HCE',
+        'violation_description': _POTENTIAL_MSG_TMPL.format(method_text, projected_comp),
+        'projected_annual_compensation': projected_comp,
+        'catch_up_amount': record['catch_up_contribution'] / 100,
+        'catch_up_type': record['catch_up_type'] or '',
+        'pay_period_start': record['pay_period_start_iso'],
+        'pay_period_end': record['pay_period_end_iso'],
+    }
+
+
+def _method_text(projection_method: str) -> str:
+    """Format the projection method for display (included for all non-legacy methods)."""
+    if projection_method == 'legacy':
+        return ""
+    return f" ({projection_method.replace('_', ' ')} projection)"
+
+
+def iter_all(payroll_data: List[Dict], config: Union[Dict, CompiledConfig]) -> Iterator[Dict]:
+    """
+    Stream both Roth catch-up checks over one shared projection pass.
+    
+    Each record is projected once. Roth-only violations (records at or above
+    the HCE threshold with Roth catch-up contributions, once
+    roth_only_risk_year applies) are yielded first, then every potential HCE.
+    Only the float projections are held in memory; findings are built as
+    they are consumed.
+    
+    Args:
+        payroll_data: List of payroll records
+        config: Configuration dictionary, or a CompiledConfig from compile_config
+        
+    Yields:
+        Violation dictionaries, then potential HCE records, for exception CSV
+    """
+    if not payroll_data:
+        return
+    
+    ctx = compile_config(config)
+    threshold = ctx.threshold
+    projections = _project(payroll_data, ctx)
+    
+    if ctx.current_year >= ctx.roth_only_risk_year:
+        for record, projected_comp in zip(payroll_data, projections):
+            if projected_comp >= threshold and record['catch_up_type'] == 'Roth' and record['catch_up_contribution'] > 0:
+                yield _roth_finding(record, projected_comp)
+    
+    method_text = _method_text(ctx.projection_method)
+    for record, projected_comp in zip(payroll_data, projections):
+        if projected_comp >= threshold:
+            yield _potential_finding(record, projected_comp, method_text)
 
 
-def check_roth_only_catchup_hce(payroll_data: List[Dict], config: Dict) -> List[Dict]:
+def iter_roth_only_catchup_hce(payroll_data: List[Dict], config: Union[Dict, CompiledConfig]) -> Iterator[Dict]:
     """
     Check 1: Identify HCEs subject to Roth-only catch-up requirement.
     
@@ -187,48 +394,37 @@ def check_roth_only_catchup_hce(payroll_data: List[Dict], config: Dict) -> List[
     
     Args:
         payroll_data: List of payroll records
-        config: Configuration dictionary
+        config: Configuration dictionary, or a CompiledConfig from compile_config
         
-    Returns:
-        List of violation dictionaries for exception CSV
+    Yields:
+        Violation dictionaries for exception CSV
     """
-    violations = []
-    current_year = config['hce_threshold']['current_year']
-    roth_only_risk_year = config['catch_up']['roth_only_risk_year']
+    # Only check a non-empty payroll, and only if current year is >= roth_only_risk_year
+    # (both decided before compiling the config)
+    if not payroll_data or not _roth_only_applies(config):
+        return
     
-    # Only check if current year is >= roth_only_risk_year
-    if current_year < roth_only_risk_year:
-        return violations
+    ctx = compile_config(config)
     
-    for record in payroll_data:
-        # Filter employees with Roth catch-up contributions
-        if (record.get('catch_up_contribution', Decimal('0')) > 0 and 
-            record.get('catch_up_type') == 'Roth'):
-            
-            # Determine if employee is an HCE
-            if is_hce(record, config):
-                projected_comp, proj_method = annualize_compensation(record, config)
-                
-                violation = {
-                    'employee_id': record['employee_id'],
-                    'employee_name': record['employee_name'],
-                    'violation_type': 'ROTH_ONLY_CATCHUP_HCE',
-                    'violation_description': (
-                        f"Catch-up contributions must be Roth for this projected HCE under SECURE 2.0 (Roth-only requirement). "
-                        f"Review payroll enforcement. Projected annual compensation: ${projected_comp:,.2f}"
-                    ),
-                    'projected_annual_compensation': float(projected_comp),
-                    'catch_up_amount': float(record['catch_up_contribution']),
-                    'catch_up_type': record['catch_up_type'],
-                    'pay_period_start': record['pay_period_start'].strftime('%Y-%m-%d'),
-                    'pay_period_end': record['pay_period_end'].strftime('%Y-%m-%d'),
-                }
-                violations.append(violation)
+    # Filter employees with Roth catch-up contributions
+    roth_records = [
+        record for record in payroll_data
+        if record['catch_up_type'] == 'Roth' and record['catch_up_contribution'] > 0
+    ]
     
-    return violations
+    # Project each once and determine if the employee is an HCE from that projection
+    threshold = ctx.threshold
+    for record, projected_comp in zip(roth_records, _project(roth_records, ctx)):
+        if projected_comp >= threshold:
+            yield _roth_finding(record, projected_comp)
 
 
-def check_potential_hce(payroll_data: List[Dict], config: Dict) -> List[Dict]:
+def check_roth_only_catchup_hce(payroll_data: List[Dict], config: Union[Dict, CompiledConfig]) -> List[Dict]:
+    """Collect iter_roth_only_catchup_hce findings into a list."""
+    return list(iter_roth_only_catchup_hce(payroll_data, config))
+
+
+def iter_potential_hce(payroll_data: List[Dict], config: Union[Dict, CompiledConfig]) -> Iterator[Dict]:
     """
     Check 2: Identify potential HCEs based on projected annual compensation.
     
@@ -236,41 +432,24 @@ def check_potential_hce(payroll_data: List[Dict], config: Dict) -> List[Dict]:
     
     Args:
         payroll_data: List of payroll records
-        config: Configuration dictionary
+        config: Configuration dictionary, or a CompiledConfig from compile_config
         
-    Returns:
-        List of potential HCE records for exception CSV (informational)
+    Yields:
+        Potential HCE records for exception CSV (informational)
     """
-    potential_hces = []
-    threshold = Decimal(str(config['hce_threshold']['compensation_limit']))
+    if not payroll_data:
+        return
     
-    for record in payroll_data:
-        # Calculate projected annual compensation
-        projected_comp, proj_method = annualize_compensation(record, config)
-        
-        # Flag if projected compensation >= threshold
-        if projected_comp >= threshold:
-            # Format projection method name for display (include for all non-legacy methods)
-            method_display = proj_method.replace('_', ' ')
-            if proj_method != 'legacy':
-                method_text = f" ({method_display} projection)"
-            else:
-                method_text = ""
-            
-            potential_hce = {
-                'employee_id': record['employee_id'],
-                'employee_name': record['employee_name'],
-                'violation_type': 'POTENTIAL_HCE',
-                'violation_description': (
-                    f"Potential HCE{method_text} based on projected annual compensation: ${projected_comp:,.2f}"
-                ),
-                'projected_annual_compensation': float(projected_comp),
-                'catch_up_amount': float(record.get('catch_up_contribution', Decimal('0'))),
-                'catch_up_type': record.get('catch_up_type') or '',
-                'pay_period_start': record['pay_period_start'].strftime('%Y-%m-%d'),
-                'pay_period_end': record['pay_period_end'].strftime('%Y-%m-%d'),
-            }
-            potential_hces.append(potential_hce)
+    ctx = compile_config(config)
+    threshold = ctx.threshold
+    method_text = _method_text(ctx.projection_method)
     
-    return potential_hces
+    # Only records at or above threshold are materialized into findings
+    for record, projected_comp in zip(payroll_data, _project(payroll_data, ctx)):
+        if projected_comp >= threshold:
+            yield _potential_finding(record, projected_comp, method_text)
+
 
+def check_potential_hce(payroll_data: List[Dict], config: Union[Dict, CompiledConfig]) -> List[Dict]:
+    """Collect iter_potential_hce findings into a list."""
+    return list(iter_potential_hce(payroll_data, config))
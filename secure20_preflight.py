@@ -7,17 +7,28 @@ SECURE 2.0 Act violations related to HCE catch-up contribution rules.
 """
 
 import argparse
+import copy
+import json
+import os
 import sys
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict
-import yaml
+from typing import Dict, List, NamedTuple, Optional
+
+# Validated configs keyed by (absolute path, mtime_ns, size), most recently used last
+_CONFIG_CACHE: 'OrderedDict[tuple, Dict]' = OrderedDict()
+_CONFIG_CACHE_MAX_SIZE = 32
 
 
 def load_config(config_path: Path) -> Dict:
     """
     Load and validate YAML configuration file.
     
+    Repeat loads of an unchanged file (same path, modification time and size)
+    within one process, such as drop-folder runs, reuse the validated config
+    instead of parsing it again. Each call returns its own copy.
+    
     Args:
         config_path: Path to YAML configuration file
         
@@ -27,9 +38,34 @@ def load_config(config_path: Path) -> Dict:
     Raises:
         SystemExit(2): If config file cannot be read or is invalid
     """
+    try:
+        stat = os.stat(config_path)
+        cache_key = (os.path.abspath(config_path), stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        cache_key = None  # Not cached; reading the file reports the error
+    
+    if cache_key in _CONFIG_CACHE:
+        _CONFIG_CACHE.move_to_end(cache_key)
+        return copy.deepcopy(_CONFIG_CACHE[cache_key])
+    
+    config = _read_config(config_path)
+    if cache_key is not None:
+        _CONFIG_CACHE[cache_key] = copy.deepcopy(config)
+        if len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX_SIZE:
+            _CONFIG_CACHE.popitem(last=False)
+    return config
+
+
+def _read_config(config_path: Path) -> Dict:
+    """Parse and validate the YAML configuration file (see load_config)."""
+    # Imported here so --help/--version and argument errors don't pay for it
+    import yaml
+    
+    # Parse YAML with libyaml's C loader when PyYAML was built with it
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=loader)
     except yaml.YAMLError as e:
         print(f"Error: Invalid YAML format in config file: {e}", file=sys.stderr)
         sys.exit(2)
@@ -96,6 +132,98 @@ def load_config(config_path: Path) -> Dict:
     return config
 
 
+class RunResult(NamedTuple):
+    """Outcome of one preflight run (see run)."""
+    status: str  # GREEN, YELLOW or RED
+    exit_code: int
+    red_findings: int
+    yellow_findings: int
+    top_employee_ids: List[str]
+    output_csv_path: Path
+    diagnostics: Dict
+
+
+def run(payroll_path: Path, config_path: Path, hours_path: Optional[Path] = None) -> RunResult:
+    """
+    Run the preflight checks in-process and write the exception CSV.
+    
+    Used by main() and by the drop-folder watcher, which calls it directly
+    instead of starting a new interpreter per file. Input errors are reported
+    on stderr and raise SystemExit(2), as on the command line.
+    
+    Args:
+        payroll_path: Path to payroll CSV file
+        config_path: Path to YAML configuration file
+        hours_path: Optional path to hours history CSV file
+        
+    Returns:
+        RunResult for the run; the CSV is written to a new timestamped
+        folder under preflight_outputs/
+    """
+    # Load configuration
+    config = load_config(config_path)
+    
+    # Import engine
+    from secure20.engine import load_payroll_data, load_hours_history, run_engine_to_csv
+    
+    # Load payroll data
+    payroll_data = load_payroll_data(payroll_path)
+    
+    # Load hours history if provided
+    hours_data = None
+    if hours_path:
+        hours_data = load_hours_history(hours_path)
+    
+    # Create timestamped output directory (includes milliseconds for uniqueness)
+    now = datetime.now()
+    timestamp = now.strftime('%Y%m%d_%H%M%S') + f"_{now.microsecond // 1000:03d}"
+    output_dir = Path('preflight_outputs') / timestamp
+    Path('preflight_outputs').mkdir(exist_ok=True)
+    # Parallel drop-folder runs can start in the same millisecond; each gets its own folder
+    suffix = 1
+    while True:
+        try:
+            output_dir.mkdir()
+            break
+        except FileExistsError:
+            output_dir = Path('preflight_outputs') / f"{timestamp}_{suffix}"
+            suffix += 1
+    
+    # Run engine with all rules, streaming findings into the exception CSV
+    # (always written, even if empty)
+    output_csv_path = output_dir / 'secure20_preflight_exceptions.csv'
+    status, exit_code, violation_count, potential_count, top_10, diagnostics = run_engine_to_csv(
+        payroll_data, config, output_csv_path, hours_data, str(config_path)
+    )
+    return RunResult(status, exit_code, violation_count, potential_count, top_10, output_csv_path, diagnostics)
+
+
+def print_summary(result: RunResult) -> None:
+    """Print a run's results and diagnostics to stdout, as the CLI reports them."""
+    print(f"STATUS: {result.status}", file=sys.stdout)
+    print(f"RED Findings: {result.red_findings}", file=sys.stdout)
+    print(f"YELLOW Findings: {result.yellow_findings}", file=sys.stdout)
+    
+    # Top 10 employee IDs (only for RED or YELLOW)
+    if result.status in ["RED", "YELLOW"] and result.top_employee_ids:
+        print(f"Top employee IDs: {', '.join(result.top_employee_ids)}", file=sys.stdout)
+    
+    print(f"Output: {result.output_csv_path}", file=sys.stdout)
+    
+    # Print diagnostics
+    diagnostics = result.diagnostics
+    print("", file=sys.stdout)
+    print("=== DIAGNOSTICS ===", file=sys.stdout)
+    print(f"Config file used: {diagnostics['config_path']}", file=sys.stdout)
+    if diagnostics['rules_executed']:
+        print(f"Rules executed: {', '.join(diagnostics['rules_executed'])}", file=sys.stdout)
+    if diagnostics['rules_skipped']:
+        print("Rules skipped:", file=sys.stdout)
+        for rule, reason in diagnostics['rules_skipped'].items():
+            print(f"  - {rule}: {reason}", file=sys.stdout)
+    print("===================", file=sys.stdout)
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -110,32 +238,38 @@ Examples:
     
     parser.add_argument(
         "--payroll", "-p",
-        type=str,
+        type=Path,
         required=True,
         help="Path to payroll CSV file"
     )
     
     parser.add_argument(
         "--config", "-c",
-        type=str,
+        type=Path,
         required=True,
         help="Path to YAML configuration file"
     )
     
     parser.add_argument(
         "--output", "-o",
-        type=str,
+        type=Path,
         default="exceptions.csv",
         help="Path to exception CSV output file (default: exceptions.csv)"
     )
     
     parser.add_argument(
         "--hours", "-hhrs",
-        type=str,
+        type=Path,
         default=None,
         help="Path to hours history CSV file (optional, enables LTPT eligibility checks)"
     )
     
+    parser.add_argument(
+        "--json-summary",
+        action="store_true",
+        help="Also print the results as one JSON object on the last stdout line (for scripts)"
+    )
+    
     parser.add_argument(
         "--version", "-v",
         action="version",
@@ -145,10 +279,10 @@ Examples:
     args = parser.parse_args()
     
     # Validate input file paths
-    payroll_path = Path(args.payroll)
-    config_path = Path(args.config)
-    output_path = Path(args.output)
-    hours_path = Path(args.hours) if args.hours else None
+    payroll_path = args.payroll
+    config_path = args.config
+    output_path = args.output
+    hours_path = args.hours
     
     if not payroll_path.exists():
         print(f"Error: Payroll file not found: {payroll_path}", file=sys.stderr)
@@ -163,68 +297,17 @@ Examples:
         sys.exit(2)
     
     try:
-        # Load configuration
-        config = load_config(config_path)
-        
-        # Import engine
-        from secure20.engine import load_payroll_data, load_hours_history, run_engine, write_exception_csv
-        
-        # Load payroll data
-        payroll_data = load_payroll_data(payroll_path)
-        
-        # Load hours history if provided
-        hours_data = None
-        if hours_path:
-            hours_data = load_hours_history(hours_path)
-        
-        # Run engine with all rules
-        status, exit_code, all_findings, violation_count, potential_count, actual_violations, potential_hces, diagnostics = run_engine(
-            payroll_data, config, hours_data, str(config_path)
-        )
-        
-        # Create timestamped output directory (includes milliseconds for uniqueness)
-        now = datetime.now()
-        timestamp = now.strftime('%Y%m%d_%H%M%S') + f"_{now.microsecond // 1000:03d}"
-        output_dir = Path('preflight_outputs') / timestamp
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Always write exception CSV (even if empty)
-        output_csv_path = output_dir / 'secure20_preflight_exceptions.csv'
-        write_exception_csv(all_findings, output_csv_path)
-        
-        # Print results
-        print(f"STATUS: {status}", file=sys.stdout)
-        print(f"RED Findings: {violation_count}", file=sys.stdout)
-        print(f"YELLOW Findings: {potential_count}", file=sys.stdout)
-        
-        # Get top 10 employee IDs (only for RED or YELLOW)
-        if status in ["RED", "YELLOW"]:
-            employee_ids = [v['employee_id'] for v in actual_violations]
-            # Add potential HCE IDs if we have fewer than 10
-            if len(employee_ids) < 10:
-                potential_ids = [v['employee_id'] for v in potential_hces 
-                               if v['employee_id'] not in employee_ids]
-                employee_ids.extend(potential_ids[:10 - len(employee_ids)])
-            
-            top_10 = employee_ids[:10]
-            if top_10:
-                print(f"Top employee IDs: {', '.join(top_10)}", file=sys.stdout)
-        
-        print(f"Output: {output_csv_path}", file=sys.stdout)
-        
-        # Print diagnostics
-        print("", file=sys.stdout)
-        print("=== DIAGNOSTICS ===", file=sys.stdout)
-        print(f"Config file used: {diagnostics['config_path']}", file=sys.stdout)
-        if diagnostics['rules_executed']:
-            print(f"Rules executed: {', '.join(diagnostics['rules_executed'])}", file=sys.stdout)
-        if diagnostics['rules_skipped']:
-            print("Rules skipped:", file=sys.stdout)
-            for rule, reason in diagnostics['rules_skipped'].items():
-                print(f"  - {rule}: {reason}", file=sys.stdout)
-        print("===================", file=sys.stdout)
-        
-        sys.exit(exit_code)
+        result = run(payroll_path, config_path, hours_path)
+        print_summary(result)
+        if args.json_summary:
+            print(json.dumps({
+                'status': result.status,
+                'red_findings': result.red_findings,
+                'yellow_findings': result.yellow_findings,
+                'top_employee_ids': result.top_employee_ids,
+                'output_csv_path': str(result.output_csv_path),
+            }), file=sys.stdout)
+        sys.exit(result.exit_code)
             
     except KeyboardInterrupt:
         print("\nError: Interrupted by user", file=sys.stderr)
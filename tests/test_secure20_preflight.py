@@ -1,32 +1,121 @@
 """
 Unit tests for SECURE 2.0 Preflight Checker
 
+Monetary record fields are integer cents, matching engine.load_payroll_data.
+
 Focused tests for:
 - Annualization from gross pay
 - Potential HCE threshold logic
 - Violation detection rules
+- Money and deferral rate parsing
+- Auto-enrollment and escalation checks
+- Config caching
+- Roth catch-up rule type checks
+- Run summary employee IDs
+- Command-line JSON summary
+- Watcher file moves and stabilization wait
+- Watcher worker pool (warm-up, worker crashes)
 """
 
+import contextlib
+import csv
+import errno
+import importlib.util
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
+from collections import OrderedDict
 from datetime import date
-from decimal import Decimal
-import sys
 from pathlib import Path
+from unittest import mock
 
-# Add parent directory to path to import secure20_preflight
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from secure20_preflight import (
+import secure20_preflight
+import watch_inbox
+from secure20.engine import (
+    _parse_cents,
+    load_payroll_data,
+    run_engine,
+    run_engine_to_csv,
+    top_employee_ids,
+)
+from secure20.rules.auto_enroll import (
+    check_auto_enroll_all,
+    check_auto_enroll_below_default,
+    check_auto_enroll_miss,
+    check_escalation_miss,
+    iter_auto_enroll_all,
+)
+from secure20.rules.roth_catchup import (
+    PROJECTION_METHODS,
+    annualize_batch,
     annualize_compensation,
-    is_hce,
     check_potential_hce,
     check_roth_only_catchup_hce,
+    is_hce,
+    iter_all,
 )
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = REPO_ROOT / 'data' / 'test'
+
+
+def payroll_record(template=None, **fields):
+    """
+    Build a payroll record shaped like load_payroll_data's, with the _iso keys taken from the dates.
+    
+    Starts from template, or a biweekly 2024 pay period with no pay or
+    catch-up, and applies fields on top.
+    """
+    if template is None:
+        template = {
+            'employee_id': 'EMP000',
+            'employee_name': 'Test Employee',
+            'gross_pay': 0,
+            'ytd_gross_pay': 0,
+            'pay_period_start': date(2024, 1, 1),
+            'pay_period_end': date(2024, 1, 14),
+            'catch_up_contribution': 0,
+            'catch_up_type': None,
+        }
+    record = {**template, **fields}
+    record['pay_period_start_iso'] = record['pay_period_start'].isoformat()
+    record['pay_period_end_iso'] = record['pay_period_end'].isoformat()
+    return record
+
+
+def projection_configs():
+    """Configs covering every projection method and legacy annualization method."""
+    base = {
+        'hce_threshold': {'current_year': 2024, 'compensation_limit': 150000},
+        'catch_up': {'roth_only_risk_year': 2024},
+        'annualization': {'method': 'gross_or_ytd'},
+    }
+    configs = [{**base, 'annualization': {'method': method}} for method in ('gross', 'ytd', 'gross_or_ytd')]
+    configs += [{**base, 'projection_method': method} for method in PROJECTION_METHODS if method != 'legacy']
+    configs.append({**base, 'projection_method': 'blend', 'blend_weight_ytd': 0.5, 'blend_weight_period': 0.5})
+    configs.append({**base, 'catch_up': {'roth_only_risk_year': 2025}})
+    return configs
+
 
 class TestViolationDetection(unittest.TestCase):
     """Tests for violation detection rules."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the shared record template once; tests override it through payroll_record."""
+        # HCE (annualized > $150k, biweekly) with Roth catch-up in 2024
+        cls.BASE_RECORD = payroll_record(
+            gross_pay=1_000_000,  # $10,000 (~$260k annualized)
+            catch_up_contribution=75_000,
+            catch_up_type='Roth',
+        )
+    
     def setUp(self):
         """Set up test fixtures."""
         self.config = {
@@ -38,16 +127,7 @@ class TestViolationDetection(unittest.TestCase):
     def test_detect_hce_roth_only_catchup_violation(self):
         """Test detection of HCE making Roth-only catch-up contributions."""
         # HCE (annualized > $150k) with Roth catch-up
-        record = {
-            'employee_id': 'EMP001',
-            'employee_name': 'HCE with Roth',
-            'gross_pay': Decimal('10000.00'),  # ~$260k annualized
-            'ytd_gross_pay': Decimal('0'),
-            'pay_period_start': date(2024, 1, 1),
-            'pay_period_end': date(2024, 1, 14),
-            'catch_up_contribution': Decimal('750.00'),
-            'catch_up_type': 'Roth',
-        }
+        record = payroll_record(self.BASE_RECORD, employee_id='EMP001', employee_name='HCE with Roth')
         
         violations = check_roth_only_catchup_hce([record], self.config)
         
@@ -61,16 +141,12 @@ class TestViolationDetection(unittest.TestCase):
     def test_no_violation_for_traditional_catchup(self):
         """Test that traditional catch-up contributions don't trigger violation."""
         # HCE with Traditional catch-up (allowed)
-        record = {
-            'employee_id': 'EMP002',
-            'employee_name': 'HCE with Traditional',
-            'gross_pay': Decimal('10000.00'),  # ~$260k annualized
-            'ytd_gross_pay': Decimal('0'),
-            'pay_period_start': date(2024, 1, 1),
-            'pay_period_end': date(2024, 1, 14),
-            'catch_up_contribution': Decimal('750.00'),
-            'catch_up_type': 'Traditional',
-        }
+        record = payroll_record(
+            self.BASE_RECORD,
+            employee_id='EMP002',
+            employee_name='HCE with Traditional',
+            catch_up_type='Traditional',
+        )
         
         violations = check_roth_only_catchup_hce([record], self.config)
         
@@ -79,16 +155,13 @@ class TestViolationDetection(unittest.TestCase):
     def test_no_violation_for_non_hce_roth_catchup(self):
         """Test that non-HCE Roth catch-up doesn't trigger violation."""
         # Non-HCE (annualized < $150k) with Roth catch-up (allowed)
-        record = {
-            'employee_id': 'EMP003',
-            'employee_name': 'Non-HCE with Roth',
-            'gross_pay': Decimal('4000.00'),  # ~$104k annualized
-            'ytd_gross_pay': Decimal('0'),
-            'pay_period_start': date(2024, 1, 1),
-            'pay_period_end': date(2024, 1, 14),
-            'catch_up_contribution': Decimal('500.00'),
-            'catch_up_type': 'Roth',
-        }
+        record = payroll_record(
+            self.BASE_RECORD,
+            employee_id='EMP003',
+            employee_name='Non-HCE with Roth',
+            gross_pay=400_000,  # $4,000 (~$104k annualized)
+            catch_up_contribution=50_000,
+        )
         
         violations = check_roth_only_catchup_hce([record], self.config)
         
@@ -97,16 +170,13 @@ class TestViolationDetection(unittest.TestCase):
     def test_no_violation_when_no_catchup(self):
         """Test that employees without catch-up contributions don't trigger violation."""
         # HCE with no catch-up contributions
-        record = {
-            'employee_id': 'EMP004',
-            'employee_name': 'HCE No Catch-up',
-            'gross_pay': Decimal('10000.00'),
-            'ytd_gross_pay': Decimal('0'),
-            'pay_period_start': date(2024, 1, 1),
-            'pay_period_end': date(2024, 1, 14),
-            'catch_up_contribution': Decimal('0'),
-            'catch_up_type': None,
-        }
+        record = payroll_record(
+            self.BASE_RECORD,
+            employee_id='EMP004',
+            employee_name='HCE No Catch-up',
+            catch_up_contribution=0,
+            catch_up_type=None,
+        )
         
         violations = check_roth_only_catchup_hce([record], self.config)
         
@@ -122,16 +192,13 @@ class TestViolationDetection(unittest.TestCase):
         }
         
         # HCE with Roth catch-up in 2023 (before restriction)
-        record = {
-            'employee_id': 'EMP005',
-            'employee_name': 'HCE Before Risk Year',
-            'gross_pay': Decimal('10000.00'),
-            'ytd_gross_pay': Decimal('0'),
-            'pay_period_start': date(2023, 1, 1),
-            'pay_period_end': date(2023, 1, 14),
-            'catch_up_contribution': Decimal('750.00'),
-            'catch_up_type': 'Roth',
-        }
+        record = payroll_record(
+            self.BASE_RECORD,
+            employee_id='EMP005',
+            employee_name='HCE Before Risk Year',
+            pay_period_start=date(2023, 1, 1),
+            pay_period_end=date(2023, 1, 14),
+        )
         
         violations = check_roth_only_catchup_hce([record], future_config)
         
@@ -140,36 +207,20 @@ class TestViolationDetection(unittest.TestCase):
     def test_violation_detection_multiple_employees(self):
         """Test violation detection with multiple employees."""
         records = [
-            {
-                'employee_id': 'EMP001',
-                'employee_name': 'HCE Roth',
-                'gross_pay': Decimal('10000.00'),
-                'ytd_gross_pay': Decimal('0'),
-                'pay_period_start': date(2024, 1, 1),
-                'pay_period_end': date(2024, 1, 14),
-                'catch_up_contribution': Decimal('750.00'),
-                'catch_up_type': 'Roth',
-            },
-            {
-                'employee_id': 'EMP002',
-                'employee_name': 'HCE Traditional',
-                'gross_pay': Decimal('10000.00'),
-                'ytd_gross_pay': Decimal('0'),
-                'pay_period_start': date(2024, 1, 1),
-                'pay_period_end': date(2024, 1, 14),
-                'catch_up_contribution': Decimal('750.00'),
-                'catch_up_type': 'Traditional',
-            },
-            {
-                'employee_id': 'EMP003',
-                'employee_name': 'Non-HCE Roth',
-                'gross_pay': Decimal('4000.00'),
-                'ytd_gross_pay': Decimal('0'),
-                'pay_period_start': date(2024, 1, 1),
-                'pay_period_end': date(2024, 1, 14),
-                'catch_up_contribution': Decimal('500.00'),
-                'catch_up_type': 'Roth',
-            },
+            payroll_record(self.BASE_RECORD, employee_id='EMP001', employee_name='HCE Roth'),
+            payroll_record(
+                self.BASE_RECORD,
+                employee_id='EMP002',
+                employee_name='HCE Traditional',
+                catch_up_type='Traditional',
+            ),
+            payroll_record(
+                self.BASE_RECORD,
+                employee_id='EMP003',
+                employee_name='Non-HCE Roth',
+                gross_pay=400_000,
+                catch_up_contribution=50_000,
+            ),
         ]
         
         violations = check_roth_only_catchup_hce(records, self.config)
@@ -193,16 +244,10 @@ class TestPotentialHCEDetection(unittest.TestCase):
     def test_detect_potential_hce_at_threshold(self):
         """Test that employees at exactly the threshold are flagged."""
         # Annualized compensation exactly at $150,000 threshold
-        record = {
-            'employee_id': 'EMP001',
-            'employee_name': 'Test Employee',
-            'gross_pay': Decimal('5753.42'),  # ~$150,000 annualized (biweekly)
-            'ytd_gross_pay': Decimal('0'),
-            'pay_period_start': date(2024, 1, 1),
-            'pay_period_end': date(2024, 1, 14),
-            'catch_up_contribution': Decimal('0'),
-            'catch_up_type': None,
-        }
+        record = payroll_record(
+            employee_id='EMP001',
+            gross_pay=575_343,  # $5,753.43 (~$150,000 annualized, biweekly)
+        )
         
         violations = check_potential_hce([record], self.config)
         
@@ -210,23 +255,18 @@ class TestPotentialHCEDetection(unittest.TestCase):
         self.assertEqual(violations[0]['violation_type'], 'POTENTIAL_HCE')
         self.assertEqual(violations[0]['employee_id'], 'EMP001')
         self.assertGreaterEqual(
-            violations[0]['projected_annual_compensation'], 
+            violations[0]['projected_annual_compensation'],
             150000.0
         )
     
     def test_detect_potential_hce_above_threshold(self):
         """Test that employees above threshold are flagged."""
         # Annualized compensation well above threshold
-        record = {
-            'employee_id': 'EMP002',
-            'employee_name': 'High Earner',
-            'gross_pay': Decimal('10000.00'),  # ~$260,000 annualized (biweekly)
-            'ytd_gross_pay': Decimal('0'),
-            'pay_period_start': date(2024, 1, 1),
-            'pay_period_end': date(2024, 1, 14),
-            'catch_up_contribution': Decimal('0'),
-            'catch_up_type': None,
-        }
+        record = payroll_record(
+            employee_id='EMP002',
+            employee_name='High Earner',
+            gross_pay=1_000_000,  # $10,000 (~$260,000 annualized, biweekly)
+        )
         
         violations = check_potential_hce([record], self.config)
         
@@ -236,16 +276,11 @@ class TestPotentialHCEDetection(unittest.TestCase):
     def test_no_flag_for_below_threshold(self):
         """Test that employees below threshold are not flagged."""
         # Annualized compensation below threshold
-        record = {
-            'employee_id': 'EMP003',
-            'employee_name': 'Regular Employee',
-            'gross_pay': Decimal('4000.00'),  # ~$104,000 annualized (biweekly)
-            'ytd_gross_pay': Decimal('0'),
-            'pay_period_start': date(2024, 1, 1),
-            'pay_period_end': date(2024, 1, 14),
-            'catch_up_contribution': Decimal('0'),
-            'catch_up_type': None,
-        }
+        record = payroll_record(
+            employee_id='EMP003',
+            employee_name='Regular Employee',
+            gross_pay=400_000,  # $4,000 (~$104,000 annualized, biweekly)
+        )
         
         violations = check_potential_hce([record], self.config)
         
@@ -254,16 +289,13 @@ class TestPotentialHCEDetection(unittest.TestCase):
     def test_detect_potential_hce_from_ytd(self):
         """Test detection of potential HCE using YTD compensation projection."""
         # YTD $80,000 through day 180 (projects to ~$162,000 annually)
-        record = {
-            'employee_id': 'EMP004',
-            'employee_name': 'YTD Employee',
-            'gross_pay': Decimal('5000.00'),
-            'ytd_gross_pay': Decimal('80000.00'),
-            'pay_period_start': date(2024, 1, 1),
-            'pay_period_end': date(2024, 6, 29),  # Day 180
-            'catch_up_contribution': Decimal('0'),
-            'catch_up_type': None,
-        }
+        record = payroll_record(
+            employee_id='EMP004',
+            employee_name='YTD Employee',
+            gross_pay=500_000,
+            ytd_gross_pay=8_000_000,
+            pay_period_end=date(2024, 6, 29),  # Day 180
+        )
         
         violations = check_potential_hce([record], self.config)
         
@@ -274,22 +306,17 @@ class TestPotentialHCEDetection(unittest.TestCase):
     def test_threshold_edge_case_just_below(self):
         """Test that employees just below threshold are not flagged."""
         # Annualized compensation just below $150,000
-        record = {
-            'employee_id': 'EMP005',
-            'employee_name': 'Edge Case',
-            'gross_pay': Decimal('5750.00'),  # Slightly below threshold
-            'ytd_gross_pay': Decimal('0'),
-            'pay_period_start': date(2024, 1, 1),
-            'pay_period_end': date(2024, 1, 14),
-            'catch_up_contribution': Decimal('0'),
-            'catch_up_type': None,
-        }
+        record = payroll_record(
+            employee_id='EMP005',
+            employee_name='Edge Case',
+            gross_pay=575_000,  # $5,750 (slightly below threshold)
+        )
         
         violations = check_potential_hce([record], self.config)
         
-        # Should not be flagged if projected is < 150000
-        projected = annualize_compensation(record, self.config)
-        if projected < Decimal('150000'):
+        # Should not be flagged if projected is < $150,000 (in cents)
+        projected, _ = annualize_compensation(record, self.config)
+        if projected < 15_000_000:
             self.assertEqual(len(violations), 0)
 
 
@@ -318,36 +345,36 @@ class TestAnnualization(unittest.TestCase):
         """Test annualization from gross pay for biweekly pay period."""
         # Biweekly: 14 days, $5000 per period
         # Expected: $5000 * (365 / 14) = $130,357.14
-        record = {
-            'employee_id': 'EMP001',
-            'employee_name': 'Test Employee',
-            'gross_pay': Decimal('5000.00'),
-            'ytd_gross_pay': Decimal('0'),
-            'pay_period_start': date(2024, 1, 1),
-            'pay_period_end': date(2024, 1, 14),
-        }
+        record = payroll_record(
+            employee_id='EMP001',
+            employee_name='Test Employee',
+            gross_pay=500_000,
+            ytd_gross_pay=0,
+            pay_period_start=date(2024, 1, 1),
+            pay_period_end=date(2024, 1, 14),
+        )
         
-        result = annualize_compensation(record, self.config_gross)
-        expected = Decimal('5000.00') * Decimal('365') / Decimal('14')
+        result, _ = annualize_compensation(record, self.config_gross)
+        expected = 500_000 * 365 / 14
         
         self.assertAlmostEqual(float(result), float(expected), places=2)
-        self.assertGreater(result, Decimal('130000'))
+        self.assertGreater(result, 13_000_000)
     
     def test_annualize_from_gross_pay_monthly(self):
         """Test annualization from gross pay for monthly pay period."""
         # Monthly: 31 days (January), $10000 per period
         # Expected: $10000 * (365 / 31) = $117,741.94
-        record = {
-            'employee_id': 'EMP002',
-            'employee_name': 'Test Employee',
-            'gross_pay': Decimal('10000.00'),
-            'ytd_gross_pay': Decimal('0'),
-            'pay_period_start': date(2024, 1, 1),
-            'pay_period_end': date(2024, 1, 31),
-        }
+        record = payroll_record(
+            employee_id='EMP002',
+            employee_name='Test Employee',
+            gross_pay=1_000_000,
+            ytd_gross_pay=0,
+            pay_period_start=date(2024, 1, 1),
+            pay_period_end=date(2024, 1, 31),
+        )
         
-        result = annualize_compensation(record, self.config_gross)
-        expected = Decimal('10000.00') * Decimal('365') / Decimal('31')
+        result, _ = annualize_compensation(record, self.config_gross)
+        expected = 1_000_000 * 365 / 31
         
         self.assertAlmostEqual(float(result), float(expected), places=2)
     
@@ -355,17 +382,17 @@ class TestAnnualization(unittest.TestCase):
         """Test annualization handles single-day pay period correctly."""
         # Single day: $1000
         # Expected: $1000 * (365 / 1) = $365,000
-        record = {
-            'employee_id': 'EMP003',
-            'employee_name': 'Test Employee',
-            'gross_pay': Decimal('1000.00'),
-            'ytd_gross_pay': Decimal('0'),
-            'pay_period_start': date(2024, 1, 1),
-            'pay_period_end': date(2024, 1, 1),
-        }
+        record = payroll_record(
+            employee_id='EMP003',
+            employee_name='Test Employee',
+            gross_pay=100_000,
+            ytd_gross_pay=0,
+            pay_period_start=date(2024, 1, 1),
+            pay_period_end=date(2024, 1, 1),
+        )
         
-        result = annualize_compensation(record, self.config_gross)
-        expected = Decimal('1000.00') * Decimal('365')
+        result, _ = annualize_compensation(record, self.config_gross)
+        expected = 100_000 * 365
         
         self.assertEqual(result, expected)
     
@@ -374,41 +401,536 @@ class TestAnnualization(unittest.TestCase):
         # YTD: $60000 through day 100 (should project to ~$219,000)
         # Gross: $5000 for 14 days (would project to ~$130,000)
         # Should use YTD projection
-        record = {
-            'employee_id': 'EMP004',
-            'employee_name': 'Test Employee',
-            'gross_pay': Decimal('5000.00'),
-            'ytd_gross_pay': Decimal('60000.00'),
-            'pay_period_start': date(2024, 1, 1),
-            'pay_period_end': date(2024, 4, 10),  # Day 100 of year
-        }
+        record = payroll_record(
+            employee_id='EMP004',
+            employee_name='Test Employee',
+            gross_pay=500_000,
+            ytd_gross_pay=6_000_000,
+            pay_period_start=date(2024, 1, 1),
+            pay_period_end=date(2024, 4, 9),  # Day 100 of leap year 2024
+        )
         
-        result = annualize_compensation(record, self.config_gross_or_ytd)
+        result, _ = annualize_compensation(record, self.config_gross_or_ytd)
         # YTD projection: $60000 * (365 / 100) = $219,000
-        expected_ytd = Decimal('60000.00') * Decimal('365') / Decimal('100')
+        expected_ytd = 6_000_000 * 365 / 100
         
         self.assertAlmostEqual(float(result), float(expected_ytd), places=2)
         # Should be much higher than gross-only projection
-        gross_projection = Decimal('5000.00') * Decimal('365') / Decimal('14')
+        gross_projection = 500_000 * 365 / 14
         self.assertGreater(result, gross_projection)
     
     def test_gross_or_ytd_falls_back_to_gross_when_ytd_zero(self):
         """Test gross_or_ytd falls back to gross when YTD is zero."""
-        record = {
-            'employee_id': 'EMP005',
-            'employee_name': 'Test Employee',
-            'gross_pay': Decimal('5000.00'),
-            'ytd_gross_pay': Decimal('0'),
-            'pay_period_start': date(2024, 1, 1),
-            'pay_period_end': date(2024, 1, 14),
-        }
+        record = payroll_record(
+            employee_id='EMP005',
+            employee_name='Test Employee',
+            gross_pay=500_000,
+            ytd_gross_pay=0,
+            pay_period_start=date(2024, 1, 1),
+            pay_period_end=date(2024, 1, 14),
+        )
         
-        result = annualize_compensation(record, self.config_gross_or_ytd)
-        expected = Decimal('5000.00') * Decimal('365') / Decimal('14')
+        result, _ = annualize_compensation(record, self.config_gross_or_ytd)
+        expected = 500_000 * 365 / 14
         
         self.assertAlmostEqual(float(result), float(expected), places=2)
 
 
+class TestMoneyParsing(unittest.TestCase):
+    """Tests for parsing money fields into integer cents."""
+    
+    def test_plain_values(self):
+        """Test the split-and-int fast path."""
+        self.assertEqual(_parse_cents('1234', 'gross_pay', 2), 123_400)
+        self.assertEqual(_parse_cents('1234.5', 'gross_pay', 2), 123_450)
+        self.assertEqual(_parse_cents(' 0.07 ', 'gross_pay', 2), 7)
+        self.assertEqual(_parse_cents('.5', 'gross_pay', 2), 50)
+        self.assertEqual(_parse_cents('+12.34', 'gross_pay', 2), 1_234)
+        self.assertEqual(_parse_cents('-12.34', 'gross_pay', 2), -1_234)
+    
+    def test_rounds_half_up_to_cents(self):
+        """Test that extra decimal places round half-up to the nearest cent."""
+        self.assertEqual(_parse_cents('1.005', 'gross_pay', 2), 101)
+        self.assertEqual(_parse_cents('1.0049', 'gross_pay', 2), 100)
+        self.assertEqual(_parse_cents('-12.345', 'gross_pay', 2), -1_235)
+        self.assertEqual(_parse_cents('1.5e2', 'gross_pay', 2), 15_000)
+        self.assertEqual(_parse_cents('1.2345e1', 'gross_pay', 2), 1_235)
+    
+    def test_invalid_values(self):
+        """Test that non-numeric and non-finite values raise ValueError."""
+        for value in ('', 'abc', '1.2.3', 'NaN', 'inf', '1,000'):
+            with self.assertRaises(ValueError):
+                _parse_cents(value, 'gross_pay', 2)
+
+
+class TestConfigCache(unittest.TestCase):
+    """Tests for load_config's per-process cache of validated configs."""
+    
+    def setUp(self):
+        """Start each test with an empty cache and a counted config reader."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.text = (REPO_ROOT / 'configs' / 'secure20_preflight_config.example.yaml').read_text()
+        for patcher in (
+            mock.patch.object(secure20_preflight, '_CONFIG_CACHE', OrderedDict()),
+            mock.patch.object(secure20_preflight, '_read_config', wraps=secure20_preflight._read_config),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.reads = secure20_preflight._read_config
+    
+    def _write(self, name, text=None):
+        """Write a config file into the temp directory and return its path."""
+        path = Path(self.tmp.name) / name
+        path.write_text(self.text if text is None else text)
+        return path
+    
+    def test_hit_returns_independent_copy(self):
+        """Test that a repeat load is served from the cache as a fresh copy."""
+        path = self._write('config.yaml')
+        
+        first = secure20_preflight.load_config(path)
+        first['hce_threshold']['compensation_limit'] = 1
+        second = secure20_preflight.load_config(path)
+        
+        self.assertEqual(self.reads.call_count, 1)
+        self.assertEqual(second['hce_threshold']['compensation_limit'], 150000)
+        self.assertIsNot(second, secure20_preflight.load_config(path))
+    
+    def test_changed_file_is_reread(self):
+        """Test that a new modification time or size invalidates the cached config."""
+        path = self._write('config.yaml')
+        secure20_preflight.load_config(path)
+        
+        # Same size, new modification time
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        secure20_preflight.load_config(path)
+        self.assertEqual(self.reads.call_count, 2)
+        
+        # New size, modification time forced back to the cached one
+        stat = path.stat()
+        path.write_text(self.text.replace('150000', '155000 '))
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        config = secure20_preflight.load_config(path)
+        self.assertEqual(self.reads.call_count, 3)
+        self.assertEqual(config['hce_threshold']['compensation_limit'], 155000)
+    
+    def test_least_recently_used_is_evicted(self):
+        """Test that the cache holds at most _CONFIG_CACHE_MAX_SIZE configs, evicting the stalest."""
+        paths = [self._write(f'config{i}.yaml') for i in range(3)]
+        
+        with mock.patch.object(secure20_preflight, '_CONFIG_CACHE_MAX_SIZE', 2):
+            secure20_preflight.load_config(paths[0])
+            secure20_preflight.load_config(paths[1])
+            secure20_preflight.load_config(paths[0])  # paths[1] is now least recently used
+            secure20_preflight.load_config(paths[2])
+            self.assertEqual(self.reads.call_count, 3)
+            
+            secure20_preflight.load_config(paths[0])
+            self.assertEqual(self.reads.call_count, 3)
+            secure20_preflight.load_config(paths[1])
+            self.assertEqual(self.reads.call_count, 4)
+        
+        self.assertEqual(len(secure20_preflight._CONFIG_CACHE), 2)
+
+
+class TestAutoEnrollBelowDefault(unittest.TestCase):
+    """Tests for the auto-enrolled below default rate check."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.config = {'auto_enroll_default_rate': 0.03}
+    
+    def _record(self, deferral_rate):
+        """Build an enrolled payroll record with the given deferral rate string."""
+        return payroll_record(
+            employee_id='EMP001',
+            gross_pay=200_000,
+            hire_date='2023-01-01',
+            deferral_start_date='2023-02-01',
+            deferral_rate=deferral_rate,
+        )
+    
+    def test_rate_just_below_default_is_flagged(self):
+        """Test that a sub-basis-point shortfall still counts as below default."""
+        findings = check_auto_enroll_below_default([self._record('0.02999')], self.config)
+        
+        self.assertEqual(len(findings), 1)
+        self.assertEqual(findings[0]['violation_type'], 'AUTO_ENROLL_BELOW_DEFAULT')
+        self.assertIn('deferral_rate=3.0%', findings[0]['violation_description'])
+    
+    def test_rate_at_default_is_not_flagged(self):
+        """Test that a rate exactly at the default is not flagged."""
+        for rate in ('0.03', '0.030', '0.03000001'):
+            findings = check_auto_enroll_below_default([self._record(rate)], self.config)
+            self.assertEqual(findings, [], rate)
+    
+    def test_unstripped_and_missing_fields(self):
+        """Test hand-built records with padded values or missing auto-enroll keys."""
+        padded = payroll_record(self._record(' 0.02 '), deferral_start_date=' 2023-02-01 ')
+        missing = self._record('0.02')
+        del missing['deferral_start_date']
+        
+        findings = check_auto_enroll_below_default([padded, missing], self.config)
+        
+        self.assertEqual(len(findings), 1)
+        self.assertIn('deferral_rate=2.0%', findings[0]['violation_description'])
+    
+    def test_invalid_rate_is_not_flagged(self):
+        """Test that blank or unparsable rates are skipped."""
+        for rate in ('', 'abc', 'NaN'):
+            findings = check_auto_enroll_below_default([self._record(rate)], self.config)
+            self.assertEqual(findings, [], rate)
+
+
+class TestAutoEnrollSinglePass(unittest.TestCase):
+    """Tests that the fused auto-enroll pass matches the single-rule checks."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.records = load_payroll_data(DATA_DIR / 'test_auto_enroll_small.csv')
+        self.config = {
+            'auto_enroll_enabled': True,
+            'auto_enroll_wait_days': 90,
+            'auto_enroll_default_rate': 0.03,
+            'escalation_enabled': True,
+            'escalation_effective_month': 1,
+        }
+    
+    def test_fused_pass_matches_single_rules(self):
+        """Test that each rule's findings match its slice of the fused pass."""
+        misses, below_default, escalation_misses = check_auto_enroll_all(self.records, self.config)
+        
+        self.assertTrue(misses and below_default and escalation_misses)
+        self.assertEqual(check_auto_enroll_miss(self.records, self.config), misses)
+        self.assertEqual(check_auto_enroll_below_default(self.records, self.config), below_default)
+        self.assertEqual(check_escalation_miss(self.records, self.config), escalation_misses)
+        self.assertEqual(
+            list(iter_auto_enroll_all(self.records, self.config)),
+            misses + below_default + escalation_misses,
+        )
+    
+    def test_disabled_rules_are_skipped(self):
+        """Test that disabled miss and escalation rules yield nothing."""
+        config = {**self.config, 'auto_enroll_enabled': False, 'escalation_enabled': False}
+        
+        misses, below_default, escalation_misses = check_auto_enroll_all(self.records, config)
+        
+        self.assertEqual(misses, [])
+        self.assertEqual(escalation_misses, [])
+        self.assertEqual(below_default, check_auto_enroll_below_default(self.records, self.config))
+    
+    def test_misses_stream_before_the_pass_ends(self):
+        """Test that the first miss is yielded without scanning the whole payroll."""
+        scanned = []
+        
+        class TrackedRecords(list):
+            def __iter__(self):
+                for record in list.__iter__(self):
+                    scanned.append(record)
+                    yield record
+        
+        records = TrackedRecords(self.records)
+        first = next(iter_auto_enroll_all(records, self.config, caps={'auto_enroll': True}))
+        
+        self.assertEqual(first['violation_type'], 'AUTO_ENROLL_MISS')
+        self.assertEqual(first['employee_id'], self.records[0]['employee_id'])
+        self.assertEqual(len(scanned), 1)
+
+
+class TestCombinedRothChecks(unittest.TestCase):
+    """Tests that the fused Roth catch-up pass matches the single checks."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Load a payroll with both Roth-only violations and potential HCEs once."""
+        cls.records = load_payroll_data(DATA_DIR / 'test_large_not_safe_payroll_5000.csv')
+    
+    def test_iter_all_matches_single_checks(self):
+        """Test that iter_all yields each single check's findings, Roth-only violations first."""
+        for config in projection_configs():
+            with self.subTest(config=config):
+                self.assertEqual(
+                    list(iter_all(self.records, config)),
+                    check_roth_only_catchup_hce(self.records, config) + check_potential_hce(self.records, config),
+                )
+
+
+@unittest.skipUnless(importlib.util.find_spec('mypy'), 'mypy is not installed')
+class TestRothCatchupTypes(unittest.TestCase):
+    """Tests that the Roth catch-up rule stays type-clean, so mypyc can compile it."""
+    
+    def test_roth_catchup_passes_mypy(self):
+        """Test that plain mypy reports no errors for the module."""
+        result = subprocess.run(
+            [sys.executable, '-m', 'mypy', '--cache-dir', os.devnull, 'secure20/rules/roth_catchup.py'],
+            cwd=REPO_ROOT, capture_output=True, text=True, timeout=300
+        )
+        
+        self.assertEqual(result.returncode, 0, result.stdout)
+
+
+class TestRunSummary(unittest.TestCase):
+    """Tests that the streaming run picks the same summary IDs as run_engine."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.config = {
+            'hce_threshold': {'current_year': 2024, 'compensation_limit': 150000},
+            'catch_up': {'roth_only_risk_year': 2024},
+            'annualization': {'method': 'gross_or_ytd'},
+            'auto_enroll_enabled': True,
+            'auto_enroll_wait_days': 90,
+            'auto_enroll_default_rate': 0.03,
+        }
+    
+    def _summary_ids(self, records):
+        """Return the streaming run's summary IDs and the IDs run_engine's findings give."""
+        _, _, _, _, _, actual_violations, potential_hces, _ = run_engine(records, self.config)
+        expected = top_employee_ids(
+            [v['employee_id'] for v in actual_violations],
+            [v['employee_id'] for v in potential_hces],
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            top_ids = run_engine_to_csv(records, self.config, Path(tmp) / 'exceptions.csv')[4]
+        return top_ids, expected
+    
+    def _record(self, employee_id, period, deferral_start_date):
+        """Build a potential-HCE pay period, auto-enrolled unless deferral_start_date is blank."""
+        return payroll_record(
+            employee_id=employee_id,
+            gross_pay=1_000_000,
+            pay_period_start=date(2024, 1, 1 + 14 * period),
+            pay_period_end=date(2024, 1, 14 + 14 * period),
+            hire_date='2023-01-01',
+            deferral_start_date=deferral_start_date,
+            deferral_rate='0.05',
+        )
+    
+    def test_summary_ids_match_run_engine(self):
+        """Test the bundled payrolls, where potential HCEs far outnumber the summary."""
+        for name in ('test_large_not_safe_payroll_5000.csv', 'test_auto_enroll_small.csv'):
+            with self.subTest(name=name):
+                top_ids, expected = self._summary_ids(load_payroll_data(DATA_DIR / name))
+                self.assertEqual(top_ids, expected)
+    
+    def test_later_red_finding_displaces_repeated_potential_id(self):
+        """Test an auto-enroll miss, found after the potential HCEs, for an ID listed twice."""
+        records = [self._record('EMP000', 0, ''), self._record('EMP000', 1, '2023-04-01')]
+        records += [self._record(f'EMP{i:03d}', 0, '2023-04-01') for i in range(1, 13)]
+        
+        top_ids, expected = self._summary_ids(records)
+        
+        self.assertEqual(expected, ['EMP000'] + [f'EMP{i:03d}' for i in range(1, 10)])
+        self.assertEqual(top_ids, expected)
+
+
+class TestJsonSummary(unittest.TestCase):
+    """Tests for the command line's --json-summary output."""
+    
+    def _run_cli(self, *extra_args):
+        """Run the checker on the demo payroll in a scratch folder; return the process and folder."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        result = subprocess.run(
+            [
+                sys.executable, str(REPO_ROOT / 'secure20_preflight.py'),
+                '--payroll', str(REPO_ROOT / 'inputs' / 'secure20_payroll_demo.csv'),
+                '--config', str(REPO_ROOT / 'configs' / 'secure20_preflight_config.example.yaml'),
+                *extra_args,
+            ],
+            cwd=tmp.name, capture_output=True, text=True, timeout=120
+        )
+        return result, Path(tmp.name)
+    
+    def test_json_summary_is_last_stdout_line(self):
+        """Test that the JSON object matches the printed summary and the exception CSV."""
+        result, tmp = self._run_cli('--json-summary')
+        summary = json.loads(result.stdout.splitlines()[-1])
+        
+        self.assertEqual(result.returncode, 2, result.stderr)
+        self.assertEqual(summary['status'], 'RED')
+        self.assertIn(f"RED Findings: {summary['red_findings']}\n", result.stdout)
+        self.assertIn(f"YELLOW Findings: {summary['yellow_findings']}\n", result.stdout)
+        self.assertIn(f"Top employee IDs: {', '.join(summary['top_employee_ids'])}\n", result.stdout)
+        with open(tmp / summary['output_csv_path'], newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), summary['red_findings'] + summary['yellow_findings'])
+    
+    def test_no_json_without_flag(self):
+        """Test that the plain summary has no JSON line."""
+        result, _ = self._run_cli()
+        
+        self.assertEqual(result.returncode, 2, result.stderr)
+        self.assertFalse(any(line.startswith('{') for line in result.stdout.splitlines()))
+
+
+class TestMoveFile(unittest.TestCase):
+    """Tests for the watcher's atomic move with a cross-filesystem fallback."""
+    
+    def setUp(self):
+        """Create a scratch inbox file and destination folder."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.src = Path(tmp.name) / 'payroll.csv'
+        self.src.write_text('employee_id\n', encoding='utf-8')
+        self.dest = Path(tmp.name) / 'processed' / 'payroll.csv'
+        self.dest.parent.mkdir()
+    
+    def test_same_filesystem_renames(self):
+        """Test that a move within one filesystem is a single rename."""
+        with mock.patch('watch_inbox.shutil.move') as fallback:
+            watch_inbox.move_file(self.src, self.dest)
+        
+        fallback.assert_not_called()
+        self.assertFalse(self.src.exists())
+        self.assertEqual(self.dest.read_text(encoding='utf-8'), 'employee_id\n')
+    
+    def test_cross_device_falls_back_to_copy(self):
+        """Test that EXDEV from os.replace falls back to shutil.move."""
+        cross_device = OSError(errno.EXDEV, 'Invalid cross-device link')
+        with mock.patch('watch_inbox.os.replace', side_effect=cross_device):
+            with mock.patch('watch_inbox.shutil.move', wraps=watch_inbox.shutil.move) as fallback:
+                watch_inbox.move_file(self.src, self.dest)
+        
+        fallback.assert_called_once_with(str(self.src), str(self.dest))
+        self.assertFalse(self.src.exists())
+        self.assertEqual(self.dest.read_text(encoding='utf-8'), 'employee_id\n')
+    
+    def test_other_errors_are_raised(self):
+        """Test that errors other than EXDEV propagate without a fallback copy."""
+        denied = PermissionError(errno.EACCES, 'Permission denied')
+        with mock.patch('watch_inbox.os.replace', side_effect=denied):
+            with mock.patch('watch_inbox.shutil.move') as fallback:
+                with self.assertRaises(PermissionError):
+                    watch_inbox.move_file(self.src, self.dest)
+        
+        fallback.assert_not_called()
+        self.assertTrue(self.src.exists())
+
+
+class TestWaitForFileStable(unittest.TestCase):
+    """Tests for the watcher's wait for a dropped file to finish writing."""
+    
+    def setUp(self):
+        """Create a scratch payroll file."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.csv_file = Path(tmp.name) / 'payroll.csv'
+        self.csv_file.write_text('employee_id\n', encoding='utf-8')
+    
+    def _timed_wait(self, **kwargs):
+        """Return wait_for_file_stable's result and how long it took."""
+        start = time.monotonic()
+        stable = watch_inbox.wait_for_file_stable(self.csv_file, **kwargs)
+        return stable, time.monotonic() - start
+    
+    def test_file_written_earlier_is_stable_at_once(self):
+        """Test that a file last modified before the quiet time is accepted after the first recheck."""
+        past = time.time() - 60
+        os.utime(self.csv_file, (past, past))
+        
+        stable, elapsed = self._timed_wait(quiet_time=0.5)
+        
+        self.assertTrue(stable)
+        self.assertLess(elapsed, 0.25)
+    
+    def test_fresh_file_waits_for_quiet_time(self):
+        """Test that a just-written file is accepted once quiet_time has passed, not long after."""
+        stable, elapsed = self._timed_wait(quiet_time=0.3)
+        
+        self.assertTrue(stable)
+        self.assertGreaterEqual(elapsed, 0.25)
+        self.assertLess(elapsed, 0.8)
+    
+    def test_growing_file_waits_until_writes_stop(self):
+        """Test that quiet time counts from the last write, and a file still growing times out."""
+        stop = threading.Event()
+        
+        def append():
+            with open(self.csv_file, 'a', encoding='utf-8') as f:
+                while not stop.wait(0.05):
+                    f.write('EMP001\n')
+                    f.flush()
+        
+        writer = threading.Thread(target=append)
+        writer.start()
+        try:
+            self.assertFalse(watch_inbox.wait_for_file_stable(self.csv_file, max_wait=0.4, quiet_time=0.2))
+            threading.Timer(0.3, stop.set).start()
+            stable, elapsed = self._timed_wait(quiet_time=0.2)
+        finally:
+            stop.set()
+            writer.join()
+        
+        self.assertTrue(stable)
+        self.assertGreaterEqual(elapsed, 0.4)
+    
+    def test_missing_file_is_not_stable(self):
+        """Test that a file removed before or while waiting is reported as not stable."""
+        self.assertFalse(watch_inbox.wait_for_file_stable(self.csv_file.with_name('missing.csv')))
+        
+        threading.Timer(0.05, self.csv_file.unlink).start()
+        self.assertFalse(watch_inbox.wait_for_file_stable(self.csv_file, quiet_time=0.5))
+
+
+class TestWorkerPool(unittest.TestCase):
+    """Tests for the watcher's worker pool: warm-up and surviving a worker dying mid-file."""
+    
+    def setUp(self):
+        """Start a one-worker pool with a scratch inbox file and failed/ folder."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.failed_path = self.tmp / 'failed'
+        self.failed_path.mkdir()
+        self.csv_file = self.tmp / 'payroll.csv'
+        self.csv_file.write_text('employee_id\n', encoding='utf-8')
+        self.pool = watch_inbox.WorkerPool(self.tmp / 'missing_config.yaml', workers=1)
+        self.addCleanup(self.pool.shutdown)
+    
+    def test_crashed_worker_fails_file_and_pool_recovers(self):
+        """Test that a crashing task moves its file to failed/ and later files still run."""
+        crashed = self.pool.submit(os._exit, 1)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(watch_inbox.file_result(self.csv_file, self.failed_path, crashed))
+        
+        self.assertFalse(self.csv_file.exists())
+        self.assertTrue((self.failed_path / 'payroll.csv').exists())
+        self.assertIn('BrokenProcessPool', (self.failed_path / 'payroll__error.txt').read_text(encoding='utf-8'))
+        self.assertEqual(self.pool.submit(abs, -1).result(timeout=60), 1)
+    
+    def test_warm_up_starts_every_worker(self):
+        """Test that warm_up, and each pool replacement, starts all workers; a replacement does not block submit."""
+        pool = watch_inbox.WorkerPool(self.tmp / 'missing_config.yaml', workers=2)
+        self.addCleanup(pool.shutdown)
+        
+        pool.warm_up()
+        self.assertEqual(len(pool._pool._processes), 2)
+        
+        with mock.patch.object(pool, '_max_files', 1), mock.patch.object(pool, 'warm_up', side_effect=AssertionError):
+            pool.submit(abs, -1).result(timeout=60)
+            first_pool = pool._pool
+            self.assertEqual(pool.submit(abs, -2).result(timeout=60), 2)
+        self.assertIsNot(pool._pool, first_pool)
+        self.assertEqual(len(pool._pool._processes), 2)
+    
+    def test_failed_replacement_pool_fails_file(self):
+        """Test that a file is moved to failed/ when the pool replacing a broken one fails too."""
+        self.pool.submit(os._exit, 1).exception(timeout=60)
+        broken_pool = mock.Mock()
+        broken_pool.submit.side_effect = watch_inbox.BrokenProcessPool('workers cannot start')
+        
+        with mock.patch.object(self.pool, '_new_pool', return_value=broken_pool):
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                future = self.pool.submit(abs, -1)
+                self.assertTrue(watch_inbox.file_result(self.csv_file, self.failed_path, future))
+        
+        self.assertIn('ERROR: Could not replace worker pool', output.getvalue())
+        self.assertTrue((self.failed_path / 'payroll.csv').exists())
+        self.assertIn('workers cannot start', (self.failed_path / 'payroll__error.txt').read_text(encoding='utf-8'))
 
 
 if __name__ == "__main__":
@@ -5,76 +5,44 @@ Drop-Folder Mode Watcher for SECURE 2.0 Preflight Checker
 Monitors inbox/ folder for new CSV files and processes them automatically.
 """
 
-import subprocess
+import multiprocessing
+import multiprocessing.synchronize
+import queue
+import signal
 import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import time
-import shutil
 import os
+import errno
+import shutil
 from pathlib import Path
-from datetime import datetime
-import re
-import yaml
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import traceback
 import io
 from contextlib import redirect_stdout, redirect_stderr
 
+from secure20_preflight import load_config, print_summary, run as run_preflight
+
 # Demo mode selection: "catchup" | "auto_enroll" | "ltpt" | "full"
 # Controls which config file is used automatically in drop-folder mode
 DEMO_MODE = "catchup"  # default: catch-up checks only
 
+# Hours history for LTPT checks, used when present
+HOURS_PATH = Path('reference/hours_history.csv')
 
-def find_latest_output_folder():
-    """Find the most recently created preflight_outputs timestamp folder."""
-    output_base = Path('preflight_outputs')
-    if not output_base.exists():
-        return None
-    
-    folders = [d for d in output_base.iterdir() if d.is_dir()]
-    if not folders:
-        return None
-    
-    # Sort by modification time, most recent first
-    folders.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-    return folders[0]
+# Runtime folders, relative to the base directory watch_inbox() switches to
+INBOX_PATH = Path('inbox')
+PROCESSED_PATH = Path('processed')
+FAILED_PATH = Path('failed')
 
+# Set True only if every CSV reaches inbox/ complete (moved or renamed in);
+# files are then checked without waiting for their size to settle
+FAST_DROP = False
 
-def parse_preflight_output(output_text):
-    """Parse the console output from secure20_preflight.py."""
-    result = {
-        'status': 'UNKNOWN',
-        'red_findings': 0,
-        'yellow_findings': 0,
-        'top_employee_ids': '',
-        'output_csv_path': ''
-    }
-    
-    lines = output_text.strip().split('\n')
-    for line in lines:
-        line = line.strip()
-        if line.startswith('STATUS:'):
-            result['status'] = line.replace('STATUS: ', '').strip()
-        elif line.startswith('RED Findings:'):
-            match = re.search(r'RED Findings:\s*(\d+)', line)
-            if match:
-                result['red_findings'] = int(match.group(1))
-        elif line.startswith('YELLOW Findings:'):
-            match = re.search(r'YELLOW Findings:\s*(\d+)', line)
-            if match:
-                result['yellow_findings'] = int(match.group(1))
-        elif line.startswith('Top employee IDs:'):
-            result['top_employee_ids'] = line.replace('Top employee IDs: ', '')
-        elif line.startswith('Output:'):
-            result['output_csv_path'] = line.replace('Output: ', '')
-    
-    # Legacy compatibility: map to old status format
-    if result['status'] == 'GREEN':
-        result['status'] = 'SAFE'
-    elif result['status'] == 'RED':
-        result['status'] = 'NOT SAFE'
-    elif result['status'] == 'YELLOW':
-        result['status'] = 'SAFE'  # YELLOW is still considered "safe" (no violations)
-    
-    return result
+# The worker pool is replaced after this many files per worker, so memory
+# held by long-lived workers cannot grow without bound
+MAX_FILES_PER_WORKER = 50
 
 
 def get_config_path(demo_mode: str) -> Path:
@@ -90,210 +58,444 @@ def get_config_path(demo_mode: str) -> Path:
     return Path(config_name)
 
 
-def process_file(csv_file: Path):
-    """Process a single CSV file through the preflight checker."""
-    # Detect frozen vs non-frozen
-    frozen = getattr(sys, "frozen", False)
-    
+class Settings(NamedTuple):
+    """Drop-folder settings, resolved once when the watcher starts (see load_settings)."""
+    config_path: Path
+    hours_path: Optional[Path]  # None when reference/hours_history.csv is absent
+
+
+def load_settings(demo_mode: str) -> Settings:
+    """Resolve the config and hours file for demo_mode, warning once about LTPT setup."""
     # Select config based on DEMO_MODE
-    config_path = get_config_path(DEMO_MODE)
-    HOURS_PATH = Path('reference/hours_history.csv')
-    
-    if not config_path.exists():
-        print(f"Error: Config file not found: {config_path}", file=sys.stderr)
-        print(f"       DEMO_MODE is set to: {DEMO_MODE}", file=sys.stderr)
-        return False
-    
-    # Check if LTPT is enabled in config
-    ltpt_enabled = False
+    config_path = get_config_path(demo_mode)
     hours_file_exists = HOURS_PATH.exists()
     
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-            ltpt_enabled = config.get('ltpt_enabled', False)
-    except Exception as e:
-        print(f"Warning: Could not read config file: {e}", file=sys.stderr)
+    # Check if LTPT is enabled in config (a missing config is reported per file)
+    ltpt_enabled = False
+    if config_path.exists():
+        try:
+            ltpt_enabled = load_config(config_path).get('ltpt_enabled', False)
+        except SystemExit:
+            pass  # load_config has printed the error; process_file reports it per file
     
     # Check LTPT configuration for ltpt and full modes
-    if DEMO_MODE.lower() in ['ltpt', 'full']:
+    if demo_mode.lower() in ['ltpt', 'full']:
         if ltpt_enabled and not hours_file_exists:
             print("LTPT enabled but reference/hours_history.csv not found; skipping LTPT.", file=sys.stderr)
     
+    return Settings(config_path, HOURS_PATH if hours_file_exists else None)
+
+
+def move_file(src: Path, dest: Path) -> None:
+    """
+    Move a file with a single atomic rename (os.replace), replacing dest.
+    
+    Falls back to shutil.move's copy-and-delete only when dest is on another
+    filesystem (EXDEV), e.g. processed/ or failed/ mounted elsewhere.
+    """
     try:
-        if frozen:
-            # EXE mode: run in-process
-            from secure20_preflight import main as preflight_main
-            
-            # Build argv list identical to CLI args
-            argv = [
-                'secure20_preflight.py',
-                '--payroll', str(csv_file),
-                '--config', str(config_path)
-            ]
-            
-            # Add --hours flag if hours file exists
-            if hours_file_exists:
-                argv.extend(['--hours', str(HOURS_PATH)])
-            
-            # Temporarily set sys.argv
-            old_argv = sys.argv
-            sys.argv = argv
-            
-            # Capture stdout and stderr
-            stdout_capture = io.StringIO()
-            stderr_capture = io.StringIO()
-            returncode = 2  # Default to error
-            
-            try:
-                with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                    preflight_main()
-                    returncode = 0  # Should not reach here (main() calls sys.exit), but just in case
-            except SystemExit as e:
-                # main() calls sys.exit(exit_code), which raises SystemExit
-                returncode = e.code if e.code is not None else 0
-            finally:
-                # Restore sys.argv
-                sys.argv = old_argv
-            
-            # Get captured output
-            output_text = stdout_capture.getvalue()
-            stderr_text = stderr_capture.getvalue()
-            
-            result = type('Result', (), {
-                'stdout': output_text,
-                'stderr': stderr_text,
-                'returncode': returncode
-            })()
-        else:
-            # Dev mode: use subprocess (keep existing behavior)
-            cmd = [
-                sys.executable,
-                'secure20_preflight.py',
-                '--payroll', str(csv_file),
-                '--config', str(config_path)
-            ]
-            
-            # Add --hours flag if hours file exists
-            if hours_file_exists:
-                cmd.extend(['--hours', str(HOURS_PATH)])
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
-        
-        # Parse output
-        output_text = result.stdout
-        parsed = parse_preflight_output(output_text)
+        os.replace(src, dest)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(src), str(dest))
+
+
+def process_file(csv_file: Path, settings: Optional[Settings] = None):
+    """Process a single CSV file through the preflight checker (settings default to DEMO_MODE's)."""
+    if settings is None:
+        settings = load_settings(DEMO_MODE)
+    config_path = settings.config_path
+    
+    if not config_path.exists():
+        print(f"Error: Config file not found: {config_path}", file=sys.stderr)
+        print(f"       DEMO_MODE is set to: {DEMO_MODE}", file=sys.stderr)
+        return False
+    
+    try:
+        # Run in-process (frozen EXE and dev alike), capturing the console
+        # output for the run summary
+        stdout_capture = io.StringIO()
+        stderr_capture = io.StringIO()
+        result = None
         
-        # Find the latest output folder (created by secure20_preflight.py)
-        output_folder = find_latest_output_folder()
+        try:
+            with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
+                result = run_preflight(csv_file, config_path, settings.hours_path)
+                print_summary(result)
+        except SystemExit:
+            pass  # Input errors are reported on stderr and raise SystemExit, as on the CLI
         
-        if output_folder:
-            # Write run summary
-            summary_path = output_folder / 'run_summary.txt'
-            with open(summary_path, 'w', encoding='utf-8') as f:
-                f.write(f"Input filename: {csv_file.name}\n")
-                f.write(f"Status: {parsed['status']}\n")
-                f.write(f"RED Findings: {parsed['red_findings']}\n")
-                f.write(f"YELLOW Findings: {parsed['yellow_findings']}\n")
-                if parsed['top_employee_ids']:
-                    f.write(f"Top employee IDs: {parsed['top_employee_ids']}\n")
-                f.write(f"Output CSV path: {parsed['output_csv_path']}\n")
-                f.write(f"\n--- Full Console Output ---\n")
-                f.write(output_text)
-                if result.stderr:
-                    f.write(f"\n--- Standard Error ---\n")
-                    f.write(result.stderr)
+        output_text = stdout_capture.getvalue()
+        stderr_text = stderr_capture.getvalue()
         
-        # Move file based on exit code (with existence check)
-        if result.returncode == 0:  # SAFE
-            if csv_file.exists():
-                dest = Path('processed') / csv_file.name
-                shutil.move(str(csv_file), str(dest))
-                print(f"Processed: {csv_file.name} -> processed/ (SAFE)")
-            else:
-                print(f"WARNING: {csv_file.name} no longer exists, skipping move to processed/")
-            return True
-        elif result.returncode == 2:  # NOT SAFE or error
-            # Check if it's actually NOT SAFE (violations) or an error
-            if parsed['status'] == 'NOT SAFE':
-                if csv_file.exists():
-                    dest = Path('processed') / csv_file.name
-                    shutil.move(str(csv_file), str(dest))
-                    print(f"Processed: {csv_file.name} -> processed/ (NOT SAFE)")
-                else:
-                    print(f"WARNING: {csv_file.name} no longer exists, skipping move to processed/")
-                return True
-            else:
-                # It's an error
-                if csv_file.exists():
-                    dest = Path('failed') / csv_file.name
-                    shutil.move(str(csv_file), str(dest))
-                    print(f"Failed: {csv_file.name} -> failed/ (Error)")
-                else:
-                    print(f"WARNING: {csv_file.name} no longer exists, skipping move to failed/")
-                return False
-        else:
-            # Unknown exit code, treat as error
+        if result is None:
+            # Input error: nothing was written, keep the messages next to the failed file
             if csv_file.exists():
-                dest = Path('failed') / csv_file.name
-                shutil.move(str(csv_file), str(dest))
-                print(f"Failed: {csv_file.name} -> failed/ (Unknown exit code: {result.returncode})")
+                dest = FAILED_PATH / csv_file.name
+                move_file(csv_file, dest)
+                error_file = FAILED_PATH / f"{csv_file.stem}__error.txt"
+                error_file.write_text(output_text + stderr_text, encoding='utf-8')
+                print(f"Failed: {csv_file.name} -> failed/ (Error)")
             else:
                 print(f"WARNING: {csv_file.name} no longer exists, skipping move to failed/")
             return False
-            
-    except subprocess.TimeoutExpired:
+        
+        # Legacy status wording: RED is NOT SAFE; GREEN and YELLOW (no violations) are SAFE
+        status = 'NOT SAFE' if result.status == 'RED' else 'SAFE'
+        
+        # Write run summary into this run's output folder, assembled and written in one go
+        parts = [
+            f"Input filename: {csv_file.name}\n",
+            f"Status: {status}\n",
+            f"RED Findings: {result.red_findings}\n",
+            f"YELLOW Findings: {result.yellow_findings}\n",
+        ]
+        if result.status in ('RED', 'YELLOW') and result.top_employee_ids:
+            parts.append(f"Top employee IDs: {', '.join(result.top_employee_ids)}\n")
+        parts.append(f"Output CSV path: {result.output_csv_path}\n")
+        parts.append("\n--- Full Console Output ---\n")
+        parts.append(output_text)
+        if stderr_text:
+            parts.append("\n--- Standard Error ---\n")
+            parts.append(stderr_text)
+        summary_path = result.output_csv_path.parent / 'run_summary.txt'
+        summary_path.write_text(''.join(parts), encoding='utf-8')
+        
+        # Checked files go to processed/ whether SAFE or NOT SAFE (with existence check)
         if csv_file.exists():
-            dest = Path('failed') / csv_file.name
-            shutil.move(str(csv_file), str(dest))
-            print(f"Failed: {csv_file.name} -> failed/ (Timeout)")
+            dest = PROCESSED_PATH / csv_file.name
+            move_file(csv_file, dest)
+            print(f"Processed: {csv_file.name} -> processed/ ({status})")
         else:
-            print(f"WARNING: {csv_file.name} no longer exists, skipping move to failed/")
-        return False
+            print(f"WARNING: {csv_file.name} no longer exists, skipping move to processed/")
+        return True
+            
     except Exception as e:
         if csv_file.exists():
-            dest = Path('failed') / csv_file.name
-            shutil.move(str(csv_file), str(dest))
+            dest = FAILED_PATH / csv_file.name
+            move_file(csv_file, dest)
             print(f"Failed: {csv_file.name} -> failed/ (Exception: {e})")
         else:
             print(f"WARNING: {csv_file.name} no longer exists, skipping move to failed/")
         return False
 
 
-def wait_for_file_stable(file_path: Path, max_wait: float = 30.0) -> bool:
-    """Wait for file size to stabilize (2 checks, 0.5s apart, max 30s)."""
-    if not file_path.exists():
-        return False
+def wait_for_file_stable(file_path: Path, max_wait: float = 30.0, quiet_time: float = 0.5) -> bool:
+    """
+    Wait for a file to stop changing (max 30s).
     
+    Stable means the size and modification time match between two checks and
+    nothing has changed for quiet_time seconds, counted from the file's mtime
+    or from the last change seen here. Checks back off exponentially from
+    10ms to 0.5s, so a file that was complete before it reached the inbox is
+    picked up almost at once, while one still being written gets the full
+    quiet time.
+    """
     start_time = time.time()
     
     # First check
     try:
-        prev_size = file_path.stat().st_size
+        stat = file_path.stat()
     except (OSError, FileNotFoundError):
         return False
+    prev_state = (stat.st_size, stat.st_mtime_ns)
+    # Last write; an mtime in the future (clock skew on a share) counts as now
+    changed_at = min(stat.st_mtime, start_time)
     
-    # Wait 0.5s and check again
+    delay = 0.01
     while (time.time() - start_time) < max_wait:
-        time.sleep(0.5)
-        if not file_path.exists():
-            return False
+        time.sleep(delay)
         try:
-            current_size = file_path.stat().st_size
-            if current_size == prev_size:
-                return True  # Size stabilized (2 checks match)
-            prev_size = current_size
+            stat = file_path.stat()
         except (OSError, FileNotFoundError):
             return False
+        current_state = (stat.st_size, stat.st_mtime_ns)
+        now = time.time()
+        if current_state != prev_state:
+            prev_state = current_state
+            changed_at = now
+        elif now - changed_at >= quiet_time:
+            return True  # Size and mtime stabilized
+        # Back off, but don't sleep past the end of the quiet time
+        delay = min(delay * 2, 0.5, max(changed_at + quiet_time - now, 0.01))
     
     return False  # Timeout reached
 
 
+def handle_file(csv_file: Path, failed_path: Path, settings: Settings, settled: bool = False) -> bool:
+    """
+    Wait for a dropped CSV to finish writing, then process it.
+    
+    Args:
+        csv_file: CSV file in the inbox
+        failed_path: Folder for files that could not be processed
+        settings: Watcher settings from load_settings
+        settled: True if the file is known to be complete (renamed into the
+            inbox, or FAST_DROP), so there is nothing to wait for
+    
+    Returns:
+        False only if processing raised and the file could not be moved to failed/
+    """
+    # Wait for file size to stabilize
+    if not settled and not wait_for_file_stable(csv_file):
+        print(f"WARNING: {csv_file.name} did not stabilize within timeout, processing anyway...")
+    
+    # Process file in try/except
+    file_name = csv_file.name
+    try:
+        success = process_file(csv_file, settings)
+        if success:
+            print(f"PROCESSED: {file_name}")
+        else:
+            print(f"FAILED: {file_name}")
+        return True
+    except Exception:
+        # On exception: move CSV to failed/ and write error file
+        return move_to_failed(csv_file, failed_path, traceback.format_exc())
+
+
+def move_to_failed(csv_file: Path, failed_path: Path, details: str) -> bool:
+    """
+    Move a CSV that could not be processed to failed/, next to an __error.txt with details.
+    
+    Returns:
+        False if the file could not be moved to failed/
+    """
+    file_name = csv_file.name
+    try:
+        if csv_file.exists():
+            dest = failed_path / file_name
+            move_file(csv_file, dest)
+        error_file = failed_path / f"{csv_file.stem}__error.txt"
+        error_file.write_text(f"Exception processing {file_name}:\n\n{details}", encoding='utf-8')
+        print(f"FAILED: {file_name}")
+        return True
+    except Exception as move_error:
+        print(f"ERROR: Failed to move {file_name} to failed/: {move_error}")
+        return False
+
+
+def file_result(csv_file: Path, failed_path: Path, future: Future) -> bool:
+    """
+    Get the result of a finished handle_file future.
+    
+    If the task raised instead, e.g. BrokenProcessPool because a worker died
+    mid-file, the file is moved to failed/ here so the watcher keeps going.
+    
+    Returns:
+        False only if the file could not be moved out of the inbox
+    """
+    try:
+        return future.result()
+    except Exception:
+        return move_to_failed(csv_file, failed_path, traceback.format_exc())
+
+
+# Set in each worker by _init_worker (only workers have one); see WorkerPool.warm_up
+_warm_up_barrier: multiprocessing.synchronize.Barrier
+
+
+def _init_worker(config_path: Path, warm_up_barrier: multiprocessing.synchronize.Barrier) -> None:
+    """
+    Pool worker initializer, run once per worker before its first file.
+    
+    Ignores Ctrl+C (the watcher stops and shuts the pool down), and imports
+    the engine and loads the config up front so a worker's first file is as
+    fast as later ones. Config errors are left for process_file to report.
+    """
+    global _warm_up_barrier
+    _warm_up_barrier = warm_up_barrier
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    
+    import secure20.engine  # noqa: F401 (imported lazily by run())
+    if config_path.exists():
+        try:
+            with redirect_stderr(io.StringIO()):
+                load_config(config_path)
+        except SystemExit:
+            pass
+
+
+def _wait_for_workers() -> None:
+    """Warm-up task: return once every worker in the pool has started and run _init_worker."""
+    _warm_up_barrier.wait()
+
+
+class WorkerPool:
+    """
+    Worker processes for the watcher, replaced after MAX_FILES_PER_WORKER files per worker.
+    
+    Once the limit is reached a fresh ProcessPoolExecutor takes over and the
+    old one is shut down without waiting, so files already submitted to it
+    still finish. (ProcessPoolExecutor's own max_tasks_per_child is not used:
+    it can hang when replacing workers on the Python versions tested.) A pool
+    broken by a worker that died is replaced the same way on the next submit.
+    A replacement pool starts all its workers straight away, but submit does
+    not wait for them; its files simply queue behind the warm-up tasks.
+    """
+    
+    def __init__(self, config_path: Path, workers: Optional[int] = None):
+        self._config_path = config_path
+        self._workers = workers or os.cpu_count() or 1
+        self._max_files = MAX_FILES_PER_WORKER * self._workers
+        self._pool = self._new_pool()
+        self._submitted = 0
+        # Replaced pools and their files, kept until those files are done
+        self._retiring: List[Tuple[ProcessPoolExecutor, List[Future]]] = []
+        self._futures: List[Future] = []
+    
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # Spawned rather than forked, so workers never inherit the watchdog observer thread
+        context = multiprocessing.get_context('spawn')
+        return ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._config_path, context.Barrier(self._workers)),
+        )
+    
+    def warm_up(self) -> None:
+        """
+        Start every worker now and wait until all of them have run _init_worker.
+        
+        A spawn pool starts a worker per submit only while none is idle, so one
+        task per worker is submitted, each blocking on a barrier until all the
+        workers are up; no worker can take two of them.
+        """
+        for future in self._start_workers():
+            future.result()
+    
+    def _start_workers(self) -> List[Future]:
+        return [self._pool.submit(_wait_for_workers) for _ in range(self._workers)]
+    
+    def _replace_pool(self) -> None:
+        self._pool.shutdown(wait=False)
+        self._retiring.append((self._pool, self._futures))
+        self._pool = self._new_pool()
+        self._submitted = 0
+        self._futures = []
+        self._start_workers()
+    
+    def submit(self, fn, *args) -> Future:
+        """Run fn(*args) in a worker, replacing the pool first if it has reached its limit or is broken."""
+        self._retiring = [(pool, futures) for pool, futures in self._retiring
+                          if not all(future.done() for future in futures)]
+        try:
+            if self._submitted >= self._max_files:
+                self._replace_pool()
+            future = self._pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died (crashed or was killed); its files fail, later ones get a fresh pool
+            try:
+                self._replace_pool()
+                future = self._pool.submit(fn, *args)
+            except Exception as e:
+                # The fresh pool failed too (e.g. its workers cannot start); fail
+                # this file through its future so the caller moves it to failed/
+                print(f"ERROR: Could not replace worker pool: {e}")
+                future = Future()
+                future.set_exception(e)
+        self._submitted += 1
+        self._futures.append(future)
+        return future
+    
+    def shutdown(self) -> None:
+        """Stop all workers without waiting; files not yet started are cancelled."""
+        for pool, _ in self._retiring:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def watch_events(inbox_path: Path, failed_path: Path, settings: Settings, pool: WorkerPool) -> bool:
+    """
+    Process CSVs as file system events report them (inotify, FSEvents or
+    ReadDirectoryChangesW via watchdog), so an idle watcher does no work.
+    Each file is handled in the worker pool, so files dropped together are
+    checked in parallel.
+    
+    Returns:
+        False without running if watchdog is not installed
+    """
+    try:
+        from watchdog.events import PatternMatchingEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return False
+    
+    # (path, settled) pairs; see handle_file
+    dropped = queue.Queue()
+    
+    class InboxHandler(PatternMatchingEventHandler):
+        def on_created(self, event):
+            dropped.put((Path(event.src_path), FAST_DROP))
+        
+        def on_moved(self, event):
+            # Files renamed into the inbox (e.g. atomic copy-then-rename) are
+            # already complete, so they skip the stabilization wait
+            dropped.put((Path(event.dest_path), True))
+    
+    observer = Observer()
+    observer.schedule(InboxHandler(patterns=['*.csv'], ignore_directories=True), str(inbox_path), recursive=False)
+    observer.start()
+    try:
+        # Files already waiting in the inbox; queued after the observer starts so none are missed
+        for csv_file in inbox_path.glob('*.csv'):
+            dropped.put((csv_file, FAST_DROP))
+        
+        inbox_dir = inbox_path.resolve()
+        in_flight: Dict[Path, Future] = {}
+        while True:
+            try:
+                # Timeout so Ctrl+C is still delivered on Windows
+                csv_file, settled = dropped.get(timeout=1)
+            except queue.Empty:
+                continue
+            finally:
+                for done in [path for path, future in in_flight.items() if future.done()]:
+                    file_result(done, failed_path, in_flight.pop(done))
+            # Files only leave the inbox once handled, so a missing or in-flight file is a repeat event
+            if (csv_file not in in_flight and csv_file.exists()
+                    and csv_file.parent.resolve() == inbox_dir):
+                in_flight[csv_file] = pool.submit(handle_file, csv_file, failed_path, settings, settled)
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def watch_polling(inbox_path: Path, failed_path: Path, settings: Settings, pool: WorkerPool) -> None:
+    """Fallback without watchdog: scan the inbox for new CSVs every second, handling them in the pool."""
+    processed_files = set()
+    in_flight: Dict[str, Future] = {}
+    while True:
+        # Files that could not be moved out of the inbox are retried
+        for name, future in list(in_flight.items()):
+            if future.done():
+                del in_flight[name]
+                if not file_result(inbox_path / name, failed_path, future):
+                    processed_files.discard(name)
+        
+        # Poll every 1s: scan inbox root for *.csv (normcase: case-insensitive on Windows, like glob)
+        with os.scandir(inbox_path) as entries:
+            csv_files = [Path(entry.path) for entry in entries
+                         if os.path.normcase(entry.name).endswith('.csv') and entry.is_file()]
+        
+        # Forget files that have left the inbox, so the set stays bounded by
+        # the inbox and a later drop with the same name is processed again
+        processed_files.intersection_update(csv_file.name for csv_file in csv_files)
+        
+        for csv_file in csv_files:
+            # Skip if already processed
+            if csv_file.name in processed_files:
+                continue
+            
+            processed_files.add(csv_file.name)
+            in_flight[csv_file.name] = pool.submit(handle_file, csv_file, failed_path, settings, FAST_DROP)
+        
+        # Sleep for 1 second before checking again
+        time.sleep(1)
+
+
 def watch_inbox():
     """Main watcher loop that monitors inbox/ for new CSV files."""
     # Determine base directory: EXE folder when frozen, else script folder
@@ -305,66 +507,40 @@ def watch_inbox():
     # Change to base directory so relative paths in process_file work correctly
     os.chdir(base_dir)
     
-    inbox_path = Path('inbox')
-    processed_path = Path('processed')
-    failed_path = Path('failed')
-    processed_files = set()
+    inbox_path = INBOX_PATH
+    processed_path = PROCESSED_PATH
+    failed_path = FAILED_PATH
     
-    # Ensure runtime folders exist
+    # Ensure runtime folders exist. As siblings of inbox/ they share its
+    # filesystem, so move_file is a single atomic rename
     inbox_path.mkdir(exist_ok=True)
     processed_path.mkdir(exist_ok=True)
     failed_path.mkdir(exist_ok=True)
     
-    print("Watching inbox/ for new CSV files...")
-    print("Press Ctrl+C to stop.\n")
+    # Config and hours file are resolved once; the config itself is re-read
+    # by run() only when the file changes
+    settings = load_settings(DEMO_MODE)
+    
+    # One worker per CPU checks files in parallel
+    pool = WorkerPool(settings.config_path)
     
     try:
-        while True:
-            # Poll every 1s: scan inbox root for *.csv
-            csv_files = list(inbox_path.glob('*.csv'))
-            
-            for csv_file in csv_files:
-                # Skip if already processed
-                if csv_file.name in processed_files:
-                    continue
-                
-                # Wait for file size to stabilize
-                if not wait_for_file_stable(csv_file):
-                    print(f"WARNING: {csv_file.name} did not stabilize within timeout, processing anyway...")
-                
-                # Process file in try/except
-                file_name = csv_file.name
-                file_stem = csv_file.stem
-                try:
-                    success = process_file(csv_file)
-                    if success:
-                        print(f"PROCESSED: {file_name}")
-                    else:
-                        print(f"FAILED: {file_name}")
-                    processed_files.add(file_name)
-                except Exception as e:
-                    # On exception: move CSV to failed/ and write error file
-                    try:
-                        if csv_file.exists():
-                            dest = failed_path / file_name
-                            shutil.move(str(csv_file), str(dest))
-                        error_file = failed_path / f"{file_stem}__error.txt"
-                        with open(error_file, 'w', encoding='utf-8') as f:
-                            f.write(f"Exception processing {file_name}:\n\n")
-                            f.write(traceback.format_exc())
-                        print(f"FAILED: {file_name}")
-                        processed_files.add(file_name)
-                    except Exception as move_error:
-                        print(f"ERROR: Failed to move {file_name} to failed/: {move_error}")
-            
-            # Sleep for 1 second before checking again
-            time.sleep(1)
-            
+        print("Warming up...")
+        pool.warm_up()
+        print("Ready.")
+        
+        print("Watching inbox/ for new CSV files...")
+        print("Press Ctrl+C to stop.\n")
+        
+        if not watch_events(inbox_path, failed_path, settings, pool):
+            watch_polling(inbox_path, failed_path, settings, pool)
     except KeyboardInterrupt:
+        pool.shutdown()
         print("\n\nWatcher stopped by user.")
         sys.exit(0)
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # per-file WorkerPool processes in frozen (PyInstaller) builds
     watch_inbox()
 